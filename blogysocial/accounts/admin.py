@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import UserModel
+from .models import UserModel, OutgoingEmail
 
 
 admin.site.register(UserModel)
+admin.site.register(OutgoingEmail)
@@ -1,6 +1,7 @@
 from django import forms
 from django.contrib.auth.forms import AuthenticationForm, PasswordResetForm, SetPasswordForm
-from .models import UserModel
+from django.template.loader import render_to_string
+from .models import UserModel, OutgoingEmail
 
 
 class UserRegistrationForm(forms.ModelForm):
@@ -107,6 +108,18 @@ class CustomPasswordResetForm(PasswordResetForm):
                 'Unfortunately we can not find an account associated with that email address')
         return email
 
+    def send_mail(self, subject_template_name, email_template_name, context,
+                  from_email, to_email, html_email_template_name=None):
+        # queued in the outbox rather than sent while the reader waits
+        subject = ''.join(render_to_string(subject_template_name, context).splitlines())
+
+        OutgoingEmail.objects.create(
+            subject=subject,
+            body=render_to_string(email_template_name, context),
+            from_email=from_email or 'no-reply@blogysocial.com',
+            to=to_email
+        )
+
 
 class PasswordResetConfirmForm(SetPasswordForm):
     new_password1 = forms.CharField(
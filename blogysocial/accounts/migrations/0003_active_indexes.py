@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-18 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_usermodel_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usermodel',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='accounts_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usermodel',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-updated_at', '-id'], name='accounts_active_updated_idx'),
+        ),
+    ]
@@ -5,12 +5,17 @@ from django.contrib.auth.models import (
     PermissionsMixin
 )
 from django.core.exceptions import ValidationError
-from django.core.mail import send_mail
 from django.core.validators import validate_email
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
+# index condition shared by the soft-delete aware indexes below
+ACTIVE = Q(is_active=True)
+
+
 class CustomAccountsManager(BaseUserManager):
     def validateUsername(self, username):
         try:
@@ -107,6 +112,10 @@ class UserModel(AbstractBaseUser, PermissionsMixin):
         null=True,
         blank=True
     )
+    topics_count = models.PositiveIntegerField(default=0, editable=False)
+    articles_count = models.PositiveIntegerField(default=0, editable=False)
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+    likes_count = models.PositiveIntegerField(default=0, editable=False)
     remember_me = models.BooleanField(default=False)
     is_active = models.BooleanField(default=False)
     is_staff = models.BooleanField(default=False)
@@ -122,14 +131,22 @@ class UserModel(AbstractBaseUser, PermissionsMixin):
     class Meta:
         verbose_name = 'Account'
         verbose_name_plural = 'Accounts'
+        # partial indexes over active rows, matching the author list orderings
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='accounts_active_created_idx',
+                         condition=ACTIVE),
+            models.Index(fields=['-updated_at', '-id'], name='accounts_active_updated_idx',
+                         condition=ACTIVE),
+        ]
 
     def email_user(self, subject, message):
-        send_mail(
-            subject,
-            message,
-            'no-reply@blogysocial.com',
-            [self.email],
-            fail_silently=False
+        # queued in the outbox, in the caller's transaction; the send_outbox
+        # command delivers it
+        return OutgoingEmail.objects.create(
+            subject=subject,
+            body=message,
+            from_email='no-reply@blogysocial.com',
+            to=self.email
         )
 
     def __str__(self):
@@ -139,3 +156,38 @@ class UserModel(AbstractBaseUser, PermissionsMixin):
     # def photo_url(self):
     #     if self.photo and hasattr(self.photo, 'url'):
     #         return self.photo.url
+
+
+class OutgoingEmail(models.Model):
+    subject = models.CharField(
+        _('Subject'),
+        max_length=255
+    )
+    body = models.TextField(_('Body'))
+    from_email = models.CharField(
+        _('From'),
+        max_length=150
+    )
+    to = models.CharField(
+        _('To'),
+        max_length=150
+    )
+    attempts = models.PositiveSmallIntegerField(default=0, editable=False)
+    # when the worker may next pick the message up: after a backoff, or once
+    # a worker that claimed it has had time to finish
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('Outgoing Email')
+        verbose_name_plural = _('Outgoing Emails')
+        indexes = [
+            models.Index(fields=['next_attempt_at'], name='accounts_outbox_due_idx',
+                         condition=Q(sent_at__isnull=True)),
+        ]
+
+    def __str__(self):
+        return '{} to {}'.format(self.subject, self.to)
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+BATCH_SIZE = 50
+MAX_ATTEMPTS = 8
+# the first retry waits a minute, each later one twice as long, up to 6 hours
+RETRY_DELAY = 60
+MAX_RETRY_DELAY = 60 * 60 * 6
+# how long a claimed batch is hidden from other workers
+CLAIM_TIMEOUT = 60 * 10
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY))
+
+
+def claim_due(batch_size=BATCH_SIZE):
+    # push the due messages' next attempt past the claim timeout so that
+    # concurrent workers skip them; a worker that dies leaves them to be
+    # picked up again once the timeout has passed
+    now = timezone.now()
+
+    with transaction.atomic():
+        emails = list(OutgoingEmail.objects.select_for_update(skip_locked=True).filter(
+            sent_at__isnull=True, attempts__lt=MAX_ATTEMPTS, next_attempt_at__lte=now
+        ).order_by('next_attempt_at', 'id')[:batch_size])
+
+        OutgoingEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+            next_attempt_at=now + timedelta(seconds=CLAIM_TIMEOUT))
+
+    return emails
+
+
+def record_failure(email, error):
+    email.attempts += 1
+    email.last_error = '{}: {}'.format(type(error).__name__, error)
+    email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+    email.save(update_fields=['attempts', 'last_error', 'next_attempt_at', 'updated_at'])
+
+
+def send_outbox(batch_size=BATCH_SIZE):
+    """
+    Deliver a batch of due outgoing emails over one connection to the mail
+    server, and return how many were sent and how many failed.
+
+    A message that fails is retried later with exponential backoff, up to
+    MAX_ATTEMPTS times, and the connection is reopened for the next one.
+    Delivery is at least once: a worker that dies between sending and
+    recording a message sends it again after the claim timeout.
+    """
+
+    emails = claim_due(batch_size)
+    sent = failed = 0
+
+    if not emails:
+        return sent, failed
+
+    connection = get_connection()
+
+    try:
+        for email in emails:
+            message = EmailMessage(
+                email.subject, email.body, email.from_email, [email.to], connection=connection)
+
+            try:
+                # a no-op while the connection is open
+                connection.open()
+                message.send()
+            except Exception as error:
+                record_failure(email, error)
+                failed += 1
+                connection.close()
+            else:
+                email.sent_at = timezone.now()
+                email.save(update_fields=['sent_at', 'updated_at'])
+                sent += 1
+    finally:
+        connection.close()
+
+    return sent, failed
@@ -0,0 +1,110 @@
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPException
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import UserModel, OutgoingEmail
+from accounts.outbox import MAX_ATTEMPTS, send_outbox
+
+
+class OutboxTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890',
+            is_active=True
+        )
+
+    def queue(self, count=1):
+        for number in range(count):
+            self.user.email_user(subject='Subject ' + str(number), message='Message')
+
+    def test_registration_queues_the_activation_email(self):
+        response = self.client.post(reverse('accounts:register'), {
+            'username': 'newauthor',
+            'email': 'newauthor@user.com',
+            'name': 'New Author',
+            'password': 'averylongpassword',
+            'password2': 'averylongpassword'
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mail.outbox, [])
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.to, 'newauthor@user.com')
+        self.assertIn('/accounts/activate/', email.body)
+
+    def test_password_reset_queues_the_email(self):
+        self.user.set_password('averylongpassword')
+        self.user.save()
+
+        self.client.post(reverse('accounts:password_reset'), {'email': self.user.email})
+
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(OutgoingEmail.objects.get().to, self.user.email)
+
+    def test_worker_sends_due_emails_over_one_connection(self):
+        self.queue(3)
+
+        with mock.patch('accounts.outbox.get_connection', wraps=mail.get_connection) as get_connection:
+            self.assertEqual(send_outbox(), (3, 0))
+
+        get_connection.assert_called_once()
+        self.assertEqual([message.subject for message in mail.outbox],
+                         ['Subject 0', 'Subject 1', 'Subject 2'])
+        self.assertFalse(OutgoingEmail.objects.filter(sent_at__isnull=True).exists())
+        self.assertEqual(send_outbox(), (0, 0))
+
+    def test_failed_emails_are_retried_with_backoff(self):
+        self.queue(2)
+
+        with mock.patch('django.core.mail.EmailMessage.send',
+                        side_effect=[SMTPException('Try again later'), 1]):
+            self.assertEqual(send_outbox(), (1, 1))
+
+        failed = OutgoingEmail.objects.get(sent_at__isnull=True)
+        self.assertEqual(failed.attempts, 1)
+        self.assertIn('Try again later', failed.last_error)
+        self.assertGreater(failed.next_attempt_at, timezone.now())
+        self.assertEqual(send_outbox(), (0, 0))
+
+        OutgoingEmail.objects.filter(pk=failed.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(send_outbox(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_backoff_grows_and_gives_up(self):
+        self.queue()
+        delays = []
+
+        with mock.patch('django.core.mail.EmailMessage.send', side_effect=SMTPException):
+            for attempt in range(MAX_ATTEMPTS):
+                started = timezone.now()
+                send_outbox()
+                email = OutgoingEmail.objects.get()
+                delays.append(email.next_attempt_at - started)
+                OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+
+            self.assertEqual(send_outbox(), (0, 0))
+
+        self.assertEqual(email.attempts, MAX_ATTEMPTS)
+        self.assertEqual(delays, sorted(delays))
+        self.assertGreater(delays[1], delays[0] + timedelta(seconds=30))
+
+    def test_command_drains_the_outbox(self):
+        self.queue(3)
+
+        out = StringIO()
+        call_command('send_outbox', once=True, batch_size=2, stdout=out)
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertIn('2 emails sent, 0 failed', out.getvalue())
+        self.assertIn('1 emails sent, 0 failed', out.getvalue())
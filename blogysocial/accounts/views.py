@@ -4,6 +4,7 @@ from django.contrib.auth import login, logout
 from django.contrib.auth.views import LoginView
 from django.contrib.auth.decorators import login_required
 from django.contrib.sites.shortcuts import get_current_site
+from django.db import transaction
 from django.http import HttpResponseRedirect
 from django.shortcuts import redirect, render
 from django.template.loader import render_to_string
@@ -31,19 +32,21 @@ def register(request):
             user.name = register_form.cleaned_data['name']
             user.set_password(register_form.cleaned_data['password'])
             user.is_active = False
-            user.save()
             current_site = get_current_site(request)
             subject = _('Activate your Account')
-            message = render_to_string(
-                'accounts/registration/account_activation_email.html',
-                {
-                    'user': user,
-                    'domain': current_site.domain,
-                    'uid': urlsafe_base64_encode(force_bytes(user.pk)),
-                    'token': account_activation_token.make_token(user),
-                },
-            )
-            user.email_user(subject=subject, message=message)
+            # the account and its activation email are stored together
+            with transaction.atomic():
+                user.save()
+                message = render_to_string(
+                    'accounts/registration/account_activation_email.html',
+                    {
+                        'user': user,
+                        'domain': current_site.domain,
+                        'uid': urlsafe_base64_encode(force_bytes(user.pk)),
+                        'token': account_activation_token.make_token(user),
+                    },
+                )
+                user.email_user(subject=subject, message=message)
             return render(request, 'accounts/registration/register_email_confirm.html', {'register_form': register_form})
         else:
             return render(request, 'accounts/registration/register.html', {'register_form': register_form})
@@ -111,10 +114,10 @@ def password_reset(request):
 @login_required
 def dashboard(request):
     articles = Article.objects.filter(
-        is_active=True).order_by('-updated_at')[:10]
+        is_active=True).order_by('-updated_at').as_rows()[:10]
 
     my_articles = Article.objects.filter(
-        added_by=request.user, is_active=True).order_by('-updated_at')[:10]
+        added_by=request.user, is_active=True).order_by('-updated_at').as_rows()[:10]
 
     comments_by_me = Comment.objects.filter(
         added_by=request.user, is_active=True).order_by('-updated_at')[:4]
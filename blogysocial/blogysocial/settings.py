@@ -1,6 +1,8 @@
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -39,6 +41,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'pages.middleware.BatchedPurgeMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -96,6 +99,50 @@ DATABASES = {
 # }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Page cache purges, recompute locks and the featured article pointer only
+# reach every gunicorn worker through a shared cache, so REDIS_URL is required
+# as soon as WEB_CONCURRENCY (which gunicorn reads too) asks for more than one.
+
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', '1'))
+
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+elif WEB_CONCURRENCY > 1:
+    raise ImproperlyConfigured(
+        'Set REDIS_URL: the per-process cache would serve stale pages with '
+        'WEB_CONCURRENCY=' + str(WEB_CONCURRENCY) + ' workers')
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'blogysocial',
+        }
+    }
+
+
+# Likes are written to the database as they happen unless LIKES_WRITE_BEHIND
+# is set, in which case they are journaled to LIKES_JOURNAL_DIR and written in
+# batches every LIKES_FLUSH_INTERVAL seconds (see posts/like_buffer.py).
+# Toggles waiting to be written are only known to the worker that took them,
+# so the mode needs a single gunicorn worker.
+
+LIKES_WRITE_BEHIND = os.getenv('LIKES_WRITE_BEHIND') == '1'
+LIKES_JOURNAL_DIR = os.getenv('LIKES_JOURNAL_DIR', os.path.join(BASE_DIR, 'var', 'likes'))
+LIKES_FLUSH_INTERVAL = 2
+
+if LIKES_WRITE_BEHIND and WEB_CONCURRENCY > 1:
+    raise ImproperlyConfigured(
+        'LIKES_WRITE_BEHIND needs a single worker: other workers would show '
+        'stale like states and counts (WEB_CONCURRENCY=' + str(WEB_CONCURRENCY) + ')')
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
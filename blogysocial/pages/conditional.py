@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+import hashlib
+
+from django.middleware.csrf import get_token
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_cookie
+
+from .invalidation import LAYOUT_TAG, tag_purged_at, tag_versions
+
+
+def conditional_page(updated_at, *tags):
+    """
+    Answer If-None-Match and If-Modified-Since for a public page with a 304
+    before the view runs.
+
+    `updated_at(**kwargs)` returns the updated_at of the page's row, or None
+    when there is no such row. The validators combine it with the versions of
+    `tags` (formatted like cached_page tags), which move whenever a comment,
+    like or related row changes, and with the reader and their CSRF secret,
+    since pages carry a per-reader nav and forms holding the token; logging
+    in rotates the secret, so a copy with a stale token is never confirmed.
+    Responses ask to be revalidated on every use and vary on cookies.
+    """
+
+    def validators(request, **kwargs):
+        if not hasattr(request, 'page_validators'):
+            request.page_validators = (None, None)
+            row_updated_at = updated_at(**kwargs)
+
+            if row_updated_at is not None:
+                page_tags = [LAYOUT_TAG] + [tag.format(**kwargs) for tag in tags]
+                reader = request.user.pk if request.user.is_authenticated else 'anonymous'
+                # issues the secret now if the reader has none, so that the
+                # token rendered into this response is the one validated next
+                get_token(request)
+
+                etag = hashlib.md5(':'.join(
+                    [str(row_updated_at), str(reader), request.META['CSRF_COOKIE'],
+                     str(getattr(request.user, 'last_login', None))] +
+                    [str(version) for version in tag_versions(page_tags)]).encode()).hexdigest()
+
+                last_modified = [row_updated_at, getattr(request.user, 'last_login', None)]
+                purged_at = tag_purged_at(page_tags)
+                if purged_at is not None:
+                    last_modified.append(datetime.fromtimestamp(purged_at, timezone.utc))
+
+                request.page_validators = (etag, max(filter(None, last_modified)))
+
+        return request.page_validators
+
+    def etag(request, *args, **kwargs):
+        return validators(request, **kwargs)[0]
+
+    def last_modified(request, *args, **kwargs):
+        return validators(request, **kwargs)[1]
+
+    def decorator(view):
+        return vary_on_cookie(cache_control(no_cache=True)(condition(etag, last_modified)(view)))
+
+    return decorator
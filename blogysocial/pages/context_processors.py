@@ -1,41 +1,55 @@
-import random
+from django.core.paginator import Page, Paginator
+from django.utils.functional import SimpleLazyObject
+from posts.models import Article
+from .sampling import sample_topics
+from .stampede import cached_compute
+from .trending import trending_topics
 
-from django.core.paginator import Paginator
-from django.shortcuts import get_object_or_404, redirect, render
-from posts.models import Topic, Article
 
+SIDEBAR_CACHE_TIMEOUT = 60 * 5
 
-def random_topics(request):
-    topics = Topic.objects.filter(is_active=True)
-    topics_list = list(topics)
-
-    if topics.count() < 20:
-        minimum_count = topics.count()
-    elif topics.count() < 1:
-        minimum_count = 0
-    else:
-        minimum_count = 20
+TRENDING_TOPICS_KEY = 'pages:trending_topics_list'
+LATEST_ARTICLES_KEY = 'pages:latest_articles'
+ARTICLES_COUNT_KEY = 'pages:articles_count'
 
-    random_topics = random.sample(topics_list, minimum_count)
+SIDEBAR_CACHE_KEYS = [
+    TRENDING_TOPICS_KEY,
+    LATEST_ARTICLES_KEY,
+    ARTICLES_COUNT_KEY,
+]
 
-    return {'random_topics': random_topics}
 
+def cached_value(key, compute):
+    # values are computed once and shared through the cache until a Topic or
+    # Article changes (see pages/invalidation.py); concurrent misses wait for
+    # a single recompute
+    return cached_compute(key, compute, SIDEBAR_CACHE_TIMEOUT)
 
-def trending_topics_list(request):
-    latest_articles_for_trending_topics = list(
-        set(Article.objects.values_list('topic__title', flat=True).order_by('-created_at')[:100]))
-
-    trending_topics_list = Topic.objects.filter(
-        title__in=latest_articles_for_trending_topics, is_active=True).order_by('-created_at')
 
-    return {'trending_topics_list': trending_topics_list}
+def get_trending_topics_list():
+    return cached_value(TRENDING_TOPICS_KEY, trending_topics)
 
 
-def articles_objects(request):
-    articles = Article.objects.filter(is_active=True).order_by('-created_at')
+def get_articles_objects():
+    articles = Article.objects.filter(is_active=True).order_by('-created_at').as_rows()
 
     paginator = Paginator(articles, per_page=10)
-    articles_objects = paginator.get_page(1)
+    paginator.count = cached_value(ARTICLES_COUNT_KEY, articles.count)
+
+    articles_objects = Page(
+        cached_value(LATEST_ARTICLES_KEY, lambda: list(articles[:10])), 1, paginator)
     articles_objects.adjusted_elided_pages = paginator.get_elided_page_range(1)
 
-    return {'articles_objects': articles_objects}
+    return articles_objects
+
+
+def random_topics(request):
+    return {'random_topics': SimpleLazyObject(sample_topics)}
+
+
+def trending_topics_list(request):
+    return {'trending_topics_list': SimpleLazyObject(get_trending_topics_list)}
+
+
+def articles_objects(request):
+    return {'articles_objects': SimpleLazyObject(get_articles_objects)}
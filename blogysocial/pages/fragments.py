@@ -0,0 +1,142 @@
+from collections import defaultdict
+import re
+import secrets
+
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from posts.likes import liked_ids
+
+
+FRAGMENTS = {}
+# hooks given the arguments of every fragment of their kind on a page before
+# any of them is rendered, so that they can be looked up together
+PREFETCHES = {}
+
+# markers carry a nonce drawn for each render, so that marker syntax written
+# into an article body (which is rendered |safe) is never taken for one
+FRAGMENT = r'<!--fragment:{nonce}:(?P<name>\w+)(?P<args>(?::[^:>]*)*)-->.*?<!--/fragment:{nonce}-->'
+
+
+def fragment(name, prefetch=None):
+    def register(function):
+        FRAGMENTS[name] = function
+        if prefetch is not None:
+            PREFETCHES[name] = prefetch
+        return function
+    return register
+
+
+def reader_role(user):
+    if user.is_staff:
+        return 'staff'
+    if user.is_authenticated:
+        return 'author'
+    return 'anonymous'
+
+
+def fragment_nonce(request):
+    if not hasattr(request, 'fragment_nonce'):
+        request.fragment_nonce = secrets.token_hex(8)
+
+    return request.fragment_nonce
+
+
+def render_fragment(request, name, *args):
+    # the per-reader part of a page, wrapped in markers so that a cached copy
+    # of the page can have it rendered again for whoever reads it next
+    nonce = fragment_nonce(request)
+    marker = ':'.join([nonce, name] + [str(arg) for arg in args])
+
+    return mark_safe('<!--fragment:' + marker + '-->' + FRAGMENTS[name](request, *args) +
+                     '<!--/fragment:' + nonce + '-->')
+
+
+def render_fragments(request, content, nonce):
+    # `nonce` is the one the page was rendered with; markers are re-rendered
+    # under it, and any that name no fragment or carry arguments the fragment
+    # cannot take are left as they are
+    pattern = re.compile(FRAGMENT.format(nonce=re.escape(nonce)), re.DOTALL)
+    request.fragment_nonce = nonce
+    matches = [match for match in pattern.finditer(content) if match.group('name') in FRAGMENTS]
+
+    for name, prefetch in PREFETCHES.items():
+        fragments_args = [match.group('args').split(':')[1:]
+                          for match in matches if match.group('name') == name]
+        if fragments_args:
+            prefetch(request, fragments_args)
+
+    def rerender(match):
+        if match.group('name') not in FRAGMENTS:
+            return match.group(0)
+
+        try:
+            return render_fragment(request, match.group('name'), *match.group('args').split(':')[1:])
+        except (TypeError, ValueError):
+            return match.group(0)
+
+    return pattern.sub(rerender, content)
+
+
+@fragment('account_nav')
+def account_nav(request):
+    return render_to_string('includes/account_nav.html', request=request)
+
+
+class LikeStates:
+    """
+    The reader's like state for the articles and comments on a page.
+
+    Ids are collected with want() while the page is put together, and the
+    first liked() call for a kind looks all of them up in one query, so a
+    list page costs one query however many items it shows.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.wanted = defaultdict(set)
+        self.known = defaultdict(dict)
+
+    def want(self, target_name, ids):
+        self.wanted[target_name].update(int(pk) for pk in ids if str(pk).isdigit())
+
+    def liked(self, target_name, pk):
+        pk = int(pk)
+        known = self.known[target_name]
+
+        if pk not in known:
+            ids = (self.wanted[target_name] | {pk}) - known.keys()
+            liked = liked_ids(self.user, target_name, ids)
+            known.update((id, id in liked) for id in ids)
+
+        return known[pk]
+
+
+def like_states(request):
+    if not hasattr(request, 'like_states'):
+        request.like_states = LikeStates(request.user)
+
+    return request.like_states
+
+
+def want_likes(target_name):
+    # prefetch hook for like fragments, whose first argument is the id
+    def prefetch(request, fragments_args):
+        like_states(request).want(target_name, [args[0] for args in fragments_args])
+    return prefetch
+
+
+@fragment('article_like', prefetch=want_likes('article'))
+def article_like(request, article_id, article_slug):
+    return render_to_string('includes/article_like.html', {
+        'article_id': article_id,
+        'article_slug': article_slug,
+        'article_like': like_states(request).liked('article', article_id)
+    })
+
+
+@fragment('comment_like', prefetch=want_likes('comment'))
+def comment_like(request, comment_id, comment_slug):
+    return render_to_string('includes/comment_like.html', {
+        'comment_slug': comment_slug,
+        'comment_like': like_states(request).liked('comment', comment_id)
+    })
@@ -0,0 +1,197 @@
+from contextlib import contextmanager
+import threading
+import time
+
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from accounts.models import UserModel
+from posts.featured import FEATURED_ARTICLE_KEY
+from posts.models import Topic, Article, Comment, Like
+from .context_processors import (
+    ARTICLES_COUNT_KEY, LATEST_ARTICLES_KEY, SIDEBAR_CACHE_KEYS, TRENDING_TOPICS_KEY)
+from .sampling import TOPIC_IDS_KEY
+
+
+# Cached output is either stored under a plain key, which is deleted, or
+# tagged, in which case its key includes the current version of each tag and
+# purging a tag bumps that version. Tags used by the public pages:
+#
+#   layout            every page (topnav and aside list topics)
+#   articles          article lists: home, articles, hot picks
+#   authors           the authors list
+#   article:<slug>    an article page
+#   topic:<slug>      a topic page
+#   author:<username> an author page
+LAYOUT_TAG = 'layout'
+
+DEPENDENCIES = {}
+
+_batch = threading.local()
+
+
+def depends(model):
+    def register(function):
+        DEPENDENCIES[model] = function
+        return function
+    return register
+
+
+@depends(Topic)
+def topic_dependencies(topic):
+    return SIDEBAR_CACHE_KEYS + [TOPIC_IDS_KEY], [LAYOUT_TAG, 'topic:' + topic.slug]
+
+
+@depends(Article)
+def article_dependencies(article):
+    keys = [LATEST_ARTICLES_KEY, ARTICLES_COUNT_KEY, TRENDING_TOPICS_KEY]
+    if article.is_featured:
+        keys.append(FEATURED_ARTICLE_KEY)
+
+    return keys, [
+        'articles',
+        'article:' + article.slug,
+        'topic:' + article.topic.slug,
+        'author:' + article.added_by.username,
+    ]
+
+
+@depends(Comment)
+def comment_dependencies(comment):
+    return [], [
+        'article:' + comment.article.slug,
+        'author:' + comment.added_by.username,
+    ]
+
+
+@depends(Like)
+def like_dependencies(like):
+    tags = ['author:' + like.added_by.username]
+
+    if like.article_id:
+        tags.append('article:' + like.article.slug)
+    if like.comment_id:
+        tags.append('article:' + like.comment.article.slug)
+    if like.topic_id:
+        tags.append('topic:' + like.topic.slug)
+
+    return [], tags
+
+
+@depends(UserModel)
+def author_dependencies(author):
+    # the author's name shows on their articles and next to their comments
+    article_slugs = set(Article.objects.filter(added_by=author).values_list('slug', flat=True))
+    article_slugs.update(Comment.objects.filter(added_by=author).values_list('article__slug', flat=True))
+
+    return [LATEST_ARTICLES_KEY], ['articles', 'authors', 'author:' + author.username] + [
+        'article:' + slug for slug in article_slugs]
+
+
+def counter_dependencies(model, pk):
+    # counter columns are shown on lists and on the row's own page; an
+    # author's counts appear on neither their articles nor their comments,
+    # so the full author walk is left to name and profile changes
+    if model is UserModel:
+        username = UserModel._base_manager.filter(pk=pk).values_list('username', flat=True).first()
+        if username is None:
+            return [], []
+        return [], ['authors', 'author:' + username]
+
+    instance = model._base_manager.filter(pk=pk).first()
+    if instance is None:
+        return [], []
+
+    try:
+        return dependencies(instance)
+    except ObjectDoesNotExist:
+        return [], [LAYOUT_TAG]
+
+
+def dependencies(instance):
+    for model, function in DEPENDENCIES.items():
+        if isinstance(instance, model):
+            return function(instance)
+    return [], []
+
+
+def tag_key(tag):
+    return 'pages:tag:' + tag
+
+
+def purged_at_key(tag):
+    return 'pages:tag_purged_at:' + tag
+
+
+def tag_versions(tags):
+    # one round trip for every tag of a cached entry; a missing version starts
+    # at the current time so it can never match an entry from before eviction
+    keys = [tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+
+    for tag, key in zip(tags, keys):
+        if key not in versions:
+            if cache.add(key, time.time_ns(), None):
+                # nothing is known about earlier purges, so assume one now
+                cache.set(purged_at_key(tag), time.time(), None)
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+def tag_purged_at(tags):
+    # the last time any of `tags` was purged, as a timestamp, or None
+    purged_at = cache.get_many([purged_at_key(tag) for tag in tags]).values()
+
+    return max(purged_at, default=None)
+
+
+def purge_now(keys, tags):
+    if keys:
+        cache.delete_many(list(keys))
+
+    for tag in tags:
+        try:
+            cache.incr(tag_key(tag))
+        except ValueError:
+            cache.set(tag_key(tag), time.time_ns(), None)
+
+    if tags:
+        cache.set_many({purged_at_key(tag): time.time() for tag in tags}, None)
+
+
+def purge(keys=(), tags=()):
+    if getattr(_batch, 'depth', 0):
+        _batch.keys.update(keys)
+        _batch.tags.update(tags)
+    else:
+        purge_now(set(keys), set(tags))
+
+
+def purge_dependencies(instance):
+    try:
+        purge(*dependencies(instance))
+    except ObjectDoesNotExist:
+        # a related row went in the same cascade delete
+        purge(tags=[LAYOUT_TAG])
+
+
+@contextmanager
+def batched_purges():
+    """
+    Collect purges and apply each key and tag once on the way out.
+
+    Wraps every request (see pages/middleware.py) so that saving many rows at
+    once, as admin bulk actions do, costs one purge per tag instead of one per
+    row.
+    """
+
+    if not getattr(_batch, 'depth', 0):
+        _batch.depth, _batch.keys, _batch.tags = 0, set(), set()
+
+    _batch.depth += 1
+    try:
+        yield
+    finally:
+        _batch.depth -= 1
+        if not _batch.depth:
+            purge_now(_batch.keys, _batch.tags)
@@ -0,0 +1,62 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import os
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from pages.search import (DOCUMENT_FIELDS, build_document, clear_index,
+                          search_backend, write_documents)
+from posts.models import Article
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for every article'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of processes stripping article markup',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of articles written per batch',
+        )
+
+    def handle(self, *args, **options):
+        if search_backend() is None:
+            self.stdout.write(self.style.WARNING(
+                'The database backend has no full-text index, nothing to rebuild'))
+            return
+
+        rows = Article.objects.order_by('id').values_list(
+            *DOCUMENT_FIELDS).iterator(chunk_size=options['batch_size'])
+        indexed = 0
+
+        with transaction.atomic():
+            clear_index()
+
+            if options['workers'] > 1:
+                with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+                    for batch in self.batches(rows, options['batch_size']):
+                        write_documents(executor.map(
+                            build_document, batch, chunksize=50))
+                        indexed += len(batch)
+            else:
+                for batch in self.batches(rows, options['batch_size']):
+                    write_documents(map(build_document, batch))
+                    indexed += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            str(indexed) + ' articles indexed'))
+
+    def batches(self, rows, size):
+        while True:
+            batch = list(islice(rows, size))
+            if not batch:
+                return
+            yield batch
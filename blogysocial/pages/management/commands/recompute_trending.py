@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from pages.trending import WINDOWS, recompute_trending
+
+
+class Command(BaseCommand):
+    help = 'Recompute the decayed trending scores for topics and articles'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window',
+            action='append',
+            choices=list(WINDOWS),
+            help='Window to recompute (default: all windows)',
+        )
+        parser.add_argument(
+            '--every',
+            type=float,
+            help='Keep running, recomputing every this many seconds',
+        )
+
+    def handle(self, *args, **options):
+        windows = options['window'] or list(WINDOWS)
+
+        while True:
+            recompute_trending(windows)
+
+            self.stdout.write(self.style.SUCCESS(
+                'Recomputed trending scores for ' + ', '.join(windows)))
+
+            if options['every'] is None:
+                return
+            time.sleep(options['every'])
@@ -0,0 +1,12 @@
+from .invalidation import batched_purges
+
+
+class BatchedPurgeMiddleware:
+    # cache purges triggered while handling a request are applied once, after
+    # the response is ready
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with batched_purges():
+            return self.get_response(request)
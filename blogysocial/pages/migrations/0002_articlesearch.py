@@ -0,0 +1,68 @@
+from django.db import migrations
+from django.utils.html import strip_tags
+
+
+def documents(Article):
+    # the rows of pages.search.build_document, as they stood
+    for article_id, title, body, topic_title, topic_description, author_name in \
+            Article.objects.values_list('id', 'title', 'body', 'topic__title',
+                                        'topic__description', 'added_by__name').iterator():
+        yield (
+            article_id,
+            title or '',
+            ' '.join(strip_tags(body or '').split()),
+            ' '.join(filter(None, [topic_title, topic_description])),
+            author_name or '',
+        )
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE pages_articlesearch USING fts5("
+            "title, body, topic, author, tokenize = 'porter unicode61')")
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE TABLE pages_articlesearch ('
+            'article_id bigint PRIMARY KEY REFERENCES posts_article (id) '
+            'ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+            'document tsvector NOT NULL)')
+        schema_editor.execute(
+            'CREATE INDEX pages_articlesearch_document_idx '
+            'ON pages_articlesearch USING GIN (document)')
+    else:
+        return
+
+    rows = list(documents(apps.get_model('posts', 'Article')))
+
+    with schema_editor.connection.cursor() as cursor:
+        if vendor == 'sqlite':
+            cursor.executemany(
+                'INSERT INTO pages_articlesearch (rowid, title, body, topic, author) '
+                'VALUES (%s, %s, %s, %s, %s)', rows)
+        else:
+            cursor.executemany(
+                'INSERT INTO pages_articlesearch (article_id, document) VALUES (%s, '
+                "setweight(to_tsvector('english', %s), 'A') || "
+                "setweight(to_tsvector('english', %s), 'C') || "
+                "setweight(to_tsvector('english', %s), 'B') || "
+                "setweight(to_tsvector('simple', %s), 'B'))", rows)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute('DROP TABLE IF EXISTS pages_articlesearch')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0001_initial'),
+        ('posts', '0002_engagement_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
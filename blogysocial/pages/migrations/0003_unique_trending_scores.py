@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-18 19:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0002_articlesearch'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='trendingscore',
+            constraint=models.UniqueConstraint(condition=models.Q(('article__isnull', False)), fields=('window', 'article'), name='pages_trend_unique_article'),
+        ),
+        migrations.AddConstraint(
+            model_name='trendingscore',
+            constraint=models.UniqueConstraint(condition=models.Q(('topic__isnull', False)), fields=('window', 'topic'), name='pages_trend_unique_topic'),
+        ),
+    ]
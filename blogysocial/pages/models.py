@@ -1,3 +1,53 @@
 from django.db import models
+from django.utils.translation import gettext_lazy as _
+from posts.models import Topic, Article
 
-# Create your models here.
+
+class TrendingScore(models.Model):
+    WINDOW_CHOICES = [
+        ('1h', _('Last hour')),
+        ('24h', _('Last 24 hours')),
+        ('7d', _('Last 7 days')),
+    ]
+
+    window = models.CharField(
+        verbose_name=_('Trending window'),
+        max_length=3,
+        choices=WINDOW_CHOICES,
+    )
+    topic = models.ForeignKey(
+        Topic,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True
+    )
+    article = models.ForeignKey(
+        Article,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True
+    )
+    score = models.FloatField(
+        verbose_name=_('Decayed activity score'),
+        default=0,
+    )
+    computed_at = models.DateTimeField(_('Computed at'))
+
+    class Meta:
+        verbose_name = _('Trending Score')
+        verbose_name_plural = _('Trending Scores')
+        indexes = [
+            models.Index(fields=['window', '-score'],
+                         name='pages_trend_window_score_idx'),
+        ]
+        # one row per article or topic and window, so that new activity
+        # can be added to it in place (see pages/trending.py)
+        constraints = [
+            models.UniqueConstraint(fields=['window', 'article'], condition=models.Q(article__isnull=False),
+                                    name='pages_trend_unique_article'),
+            models.UniqueConstraint(fields=['window', 'topic'], condition=models.Q(topic__isnull=False),
+                                    name='pages_trend_unique_topic'),
+        ]
+
+    def __str__(self):
+        return '{} {} {}'.format(self.window, self.topic or self.article, self.score)
@@ -0,0 +1,74 @@
+from functools import wraps
+import hashlib
+import re
+
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+
+from .fragments import fragment_nonce, render_fragments
+from .invalidation import LAYOUT_TAG, tag_versions
+
+
+PAGE_CACHE_TIMEOUT = 60 * 10
+
+# tokens are per visitor, so cached pages store a placeholder instead
+CSRF_PLACEHOLDER = 'csrf-token-placeholder'
+CSRF_INPUT = re.compile(r'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+
+
+def page_cache_key(request, tags):
+    versions = ':'.join(str(version) for version in tag_versions(tags))
+
+    return 'pages:cached_page:' + hashlib.md5(
+        (request.get_full_path() + '|' + versions).encode()).hexdigest()
+
+
+def cached_page(*tags):
+    """
+    Serve GET requests for a public page from the cache, keyed by path.
+
+    The page is dropped whenever one of `tags` is purged (see
+    pages/invalidation.py); tags are formatted with the view's keyword
+    arguments, as in 'article:{article_slug}'. Every page also carries the
+    layout tag.
+
+    Every reader shares one stored copy of the page. The parts wrapped in
+    {% fragment %} tags (see pages/fragments.py) are rendered again for
+    signed-in readers, and CSRF tokens are filled in per request. Requests
+    with pending messages skip the cache so the messages are not lost.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or len(get_messages(request)):
+                return view(request, *args, **kwargs)
+
+            key = page_cache_key(
+                request, [LAYOUT_TAG] + [tag.format(**kwargs) for tag in tags])
+            entry = cache.get(key)
+
+            if entry is None:
+                response = view(request, *args, **kwargs)
+
+                if response.status_code == 200 and not response.streaming:
+                    content = CSRF_INPUT.sub(
+                        r'\g<1>' + CSRF_PLACEHOLDER + r'\g<2>', response.content.decode(response.charset))
+                    cache.set(key, (content, response['Content-Type'], request.user.is_authenticated,
+                                    fragment_nonce(request)), PAGE_CACHE_TIMEOUT)
+
+                return response
+
+            content, content_type, rendered_signed_in, nonce = entry
+
+            if rendered_signed_in or request.user.is_authenticated:
+                content = render_fragments(request, content, nonce)
+
+            return HttpResponse(
+                content.replace(CSRF_PLACEHOLDER, get_token(request)), content_type=content_type)
+
+        return wrapper
+
+    return decorator
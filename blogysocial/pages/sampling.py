@@ -0,0 +1,31 @@
+from array import array
+import random
+
+from django.core.cache import cache
+from posts.models import Topic
+
+
+TOPIC_IDS_KEY = 'pages:active_topic_ids'
+TOPIC_IDS_TIMEOUT = 60 * 60
+
+
+def active_topic_ids():
+    # a compact array of every active topic id, rebuilt only when a topic
+    # changes (see pages/invalidation.py)
+    topic_ids = cache.get(TOPIC_IDS_KEY)
+
+    if topic_ids is None:
+        topic_ids = array('q', Topic.objects.filter(
+            is_active=True).order_by().values_list('id', flat=True))
+        cache.set(TOPIC_IDS_KEY, topic_ids, TOPIC_IDS_TIMEOUT)
+
+    return topic_ids
+
+
+def sample_topics(count=20):
+    topic_ids = active_topic_ids()
+    sampled_ids = random.sample(topic_ids, min(len(topic_ids), count))
+
+    topics = Topic.objects.filter(is_active=True).in_bulk(sampled_ids)
+
+    return [topics[topic_id] for topic_id in sampled_ids if topic_id in topics]
@@ -0,0 +1,187 @@
+from array import array
+import hashlib
+import re
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from django.utils.html import strip_tags
+from posts.models import Article
+from .stampede import cached_compute
+
+
+SEARCH_TABLE = 'pages_articlesearch'
+
+# relative weight of each indexed column when ranking results
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+TOPIC_WEIGHT = 2.0
+AUTHOR_WEIGHT = 2.0
+
+SEARCH_CACHE_TIMEOUT = 60 * 10
+SEARCH_VERSION_KEY = 'pages:search_version'
+
+DOCUMENT_FIELDS = ('id', 'title', 'body', 'topic__title',
+                   'topic__description', 'added_by__name')
+
+
+def search_backend():
+    # sqlite uses an FTS5 virtual table, postgresql a tsvector column with a
+    # GIN index; any other database falls back to icontains lookups
+    if connection.vendor in ('sqlite', 'postgresql'):
+        return connection.vendor
+    return None
+
+
+def build_document(row):
+    article_id, title, body, topic_title, topic_description, author_name = row
+
+    return (
+        article_id,
+        title or '',
+        ' '.join(strip_tags(body or '').split()),
+        ' '.join(filter(None, [topic_title, topic_description])),
+        author_name or '',
+    )
+
+
+def stem(term):
+    # a light suffix stripper for the cache key and the icontains fallback;
+    # 'planets', 'planet' and 'planeting' all reduce to 'planet'
+    for suffix, replacement in (('sses', 'ss'), ('ies', 'y'), ('ing', ''), ('ed', ''), ('s', '')):
+        if term.endswith(suffix) and len(term) - len(suffix) >= 3 and not term.endswith('ss'):
+            return term[:-len(suffix)] + replacement
+    return term
+
+
+def query_terms(query):
+    # lowercased, de-duplicated and sorted; the full-text backends stem these
+    # themselves
+    return sorted(set(re.findall(r'\w+', (query or '').lower())))
+
+
+def search_key(query):
+    # stemmed so that equivalent queries share one cache entry
+    terms = sorted(set(stem(term) for term in query_terms(query)))
+    return 'pages:search:{}:{}'.format(
+        search_version(), hashlib.md5(' '.join(terms).encode()).hexdigest())
+
+
+def write_documents(documents):
+    documents = list(documents)
+    backend = search_backend()
+
+    if not documents or backend is None:
+        return
+
+    with connection.cursor() as cursor:
+        if backend == 'sqlite':
+            cursor.executemany(
+                'DELETE FROM ' + SEARCH_TABLE + ' WHERE rowid = %s',
+                [(document[0],) for document in documents])
+            cursor.executemany(
+                'INSERT INTO ' + SEARCH_TABLE +
+                ' (rowid, title, body, topic, author) VALUES (%s, %s, %s, %s, %s)',
+                documents)
+        else:
+            cursor.executemany(
+                'INSERT INTO ' + SEARCH_TABLE + ' (article_id, document) VALUES (%s, '
+                "setweight(to_tsvector('english', %s), 'A') || "
+                "setweight(to_tsvector('english', %s), 'C') || "
+                "setweight(to_tsvector('english', %s), 'B') || "
+                "setweight(to_tsvector('simple', %s), 'B')) "
+                'ON CONFLICT (article_id) DO UPDATE SET document = EXCLUDED.document',
+                documents)
+
+
+def index_articles(articles):
+    write_documents(build_document(row)
+                    for row in articles.values_list(*DOCUMENT_FIELDS))
+
+
+def remove_articles(article_ids):
+    if search_backend() is None or not article_ids:
+        return
+
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            'DELETE FROM ' + SEARCH_TABLE +
+            (' WHERE rowid = %s' if search_backend() == 'sqlite' else ' WHERE article_id = %s'),
+            [(article_id,) for article_id in article_ids])
+
+
+def clear_index():
+    if search_backend() is None:
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute('DELETE FROM ' + SEARCH_TABLE)
+
+
+def search_article_ids(query):
+    # ids of active articles matching every term of the query, best first
+    terms = query_terms(query)
+    backend = search_backend()
+
+    if not terms:
+        return []
+
+    if backend == 'sqlite':
+        sql = (
+            'SELECT s.rowid FROM ' + SEARCH_TABLE + ' s '
+            'JOIN posts_article a ON a.id = s.rowid '
+            'WHERE ' + SEARCH_TABLE + ' MATCH %s AND a.is_active '
+            'ORDER BY bm25(' + SEARCH_TABLE + ', %s, %s, %s, %s), s.rowid DESC'
+        )
+        params = [
+            ' '.join('"' + term + '"*' for term in terms),
+            TITLE_WEIGHT, BODY_WEIGHT, TOPIC_WEIGHT, AUTHOR_WEIGHT,
+        ]
+    elif backend == 'postgresql':
+        sql = (
+            'SELECT s.article_id FROM ' + SEARCH_TABLE + ' s '
+            'JOIN posts_article a ON a.id = s.article_id '
+            "WHERE s.document @@ to_tsquery('english', %s) AND a.is_active "
+            "ORDER BY ts_rank(s.document, to_tsquery('english', %s)) DESC, s.article_id DESC"
+        )
+        tsquery = ' & '.join(term + ':*' for term in terms)
+        params = [tsquery, tsquery]
+    else:
+        condition = Q()
+        for term in set(stem(term) for term in terms):
+            condition &= (
+                Q(title__icontains=term) |
+                Q(body__icontains=term) |
+                Q(topic__title__icontains=term) |
+                Q(topic__description__icontains=term) |
+                Q(added_by__name__icontains=term)
+            )
+        return list(Article.objects.filter(condition, is_active=True).order_by(
+            '-created_at').values_list('id', flat=True))
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_version():
+    return cache.get_or_set(SEARCH_VERSION_KEY, 1, None)
+
+
+def bump_search_version():
+    try:
+        cache.incr(SEARCH_VERSION_KEY)
+    except ValueError:
+        cache.set(SEARCH_VERSION_KEY, 1, None)
+
+
+def cached_search(query):
+    # (ordered ids, total count) for the query, shared by every results page
+    # until an article changes
+    key = search_key(query)
+
+    def search():
+        article_ids = array('q', search_article_ids(query))
+        return (article_ids, len(article_ids))
+
+    return cached_compute(key, search, SEARCH_CACHE_TIMEOUT)
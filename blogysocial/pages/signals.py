@@ -0,0 +1,100 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from accounts.models import UserModel
+from posts.models import Topic, Article, Comment, Like
+from posts.signals import counters_changed, featured_article_changed
+from .invalidation import counter_dependencies, purge, purge_dependencies
+from .search import bump_search_version, index_articles, remove_articles
+from .trending import record_activity
+
+
+@receiver(post_save, sender=Article)
+def index_saved_article(sender, instance, **kwargs):
+    index_articles(Article.objects.filter(pk=instance.pk))
+    bump_search_version()
+
+
+@receiver(post_delete, sender=Article)
+def remove_deleted_article(sender, instance, **kwargs):
+    remove_articles([instance.pk])
+    bump_search_version()
+
+
+@receiver(post_save, sender=Topic)
+def index_topic_articles(sender, instance, created, **kwargs):
+    if not created:
+        index_articles(Article.objects.filter(topic=instance))
+        bump_search_version()
+
+
+@receiver(post_save, sender=UserModel)
+def index_author_articles(sender, instance, created, update_fields=None, **kwargs):
+    # logins only touch last_login, which is not part of the index
+    if created or (update_fields and 'name' not in update_fields):
+        return
+
+    index_articles(Article.objects.filter(added_by=instance))
+    bump_search_version()
+
+
+@receiver(pre_save, sender=Topic)
+@receiver(pre_save, sender=Article)
+@receiver(pre_save, sender=Comment)
+@receiver(pre_save, sender=Like)
+@receiver(pre_save, sender=UserModel)
+def invalidate_previous_dependencies(sender, instance, update_fields=None, **kwargs):
+    # a full save may move the row (new slug, topic or author), so whatever
+    # depended on its stored state goes too; partial saves never move rows
+    if instance.pk is None or update_fields:
+        return
+
+    previous = sender._base_manager.filter(pk=instance.pk).first()
+    if previous is not None:
+        purge_dependencies(previous)
+
+
+@receiver(post_save, sender=Topic)
+@receiver(post_delete, sender=Topic)
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Like)
+@receiver(post_delete, sender=Like)
+def invalidate_dependencies(sender, instance, **kwargs):
+    purge_dependencies(instance)
+
+
+@receiver(post_save, sender=UserModel)
+def invalidate_author_dependencies(sender, instance, update_fields=None, **kwargs):
+    # logins only touch last_login, which no public page shows
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+
+    purge_dependencies(instance)
+
+
+@receiver(counters_changed)
+def invalidate_counted_dependencies(sender, pk, **kwargs):
+    # counter updates bypass save(), so the row is read back to find its pages
+    purge(*counter_dependencies(sender, pk))
+
+
+@receiver(featured_article_changed)
+def invalidate_featured_article(sender, **kwargs):
+    # the pointer itself is already replaced; only the home page shows it
+    purge(tags=['articles'])
+
+
+@receiver(post_save, sender=Article)
+def score_new_article(sender, instance, created, **kwargs):
+    if created and instance.is_active:
+        record_activity('article', instance.pk, instance.topic_id, instance.created_at)
+
+
+@receiver(post_save, sender=Comment)
+def score_new_comment(sender, instance, created, **kwargs):
+    if created and instance.is_active:
+        record_activity('comment', instance.article_id, instance.article.topic_id, instance.created_at)
+
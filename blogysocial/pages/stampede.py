@@ -0,0 +1,88 @@
+from contextlib import contextmanager
+import math
+import random
+import time
+
+from django.core.cache import cache
+
+
+# how long a recompute may hold its lock before another worker may take over
+LOCK_TIMEOUT = 30
+# how long a worker waits for another worker's recompute of a missing value
+WAIT_TIMEOUT = 5
+WAIT_INTERVAL = 0.05
+# how long an expired value may still be served while it is being recomputed
+STALE_TIMEOUT = 60 * 5
+# larger values refresh hot keys earlier; 1.0 is the usual choice
+EARLY_EXPIRY_BETA = 1.0
+
+
+@contextmanager
+def recompute_lock(key):
+    # True for the one worker allowed to recompute `key` right now
+    lock_key = key + ':lock'
+    locked = cache.add(lock_key, True, LOCK_TIMEOUT)
+
+    try:
+        yield locked
+    finally:
+        if locked:
+            cache.delete(lock_key)
+
+
+def expires_early(expires_at, duration, beta=EARLY_EXPIRY_BETA):
+    # probabilistic early expiry: the closer the expiry and the longer the
+    # recompute takes, the likelier a reader is to refresh ahead of time
+    return time.time() - duration * beta * math.log(1.0 - random.random()) >= expires_at
+
+
+def store(key, compute, timeout, stale_timeout):
+    started = time.monotonic()
+    value = compute()
+    duration = time.monotonic() - started
+
+    cache.set(key, (value, duration, time.time() + timeout), timeout + stale_timeout)
+
+    return value
+
+
+def cached_compute(key, compute, timeout, stale_timeout=STALE_TIMEOUT):
+    """
+    Return the cached value of `compute()`, recomputing it at most once at a
+    time across workers.
+
+    An expired value is kept for `stale_timeout` more seconds and served to
+    everyone but the worker that refreshes it. When there is no value at all,
+    other workers wait up to WAIT_TIMEOUT for the refresh before computing it
+    themselves.
+    """
+
+    entry = cache.get(key)
+
+    if entry is not None:
+        value, duration, expires_at = entry
+
+        if not expires_early(expires_at, duration):
+            return value
+
+        with recompute_lock(key) as locked:
+            if locked:
+                return store(key, compute, timeout, stale_timeout)
+
+        return value
+
+    deadline = time.monotonic() + WAIT_TIMEOUT
+
+    while True:
+        with recompute_lock(key) as locked:
+            if locked:
+                return store(key, compute, timeout, stale_timeout)
+
+        if time.monotonic() > deadline:
+            return compute()
+
+        time.sleep(WAIT_INTERVAL)
+
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
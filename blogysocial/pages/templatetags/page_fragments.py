@@ -0,0 +1,46 @@
+from django import template
+
+from pages.fragments import like_states, reader_role, render_fragment
+from pages.invalidation import tag_versions
+
+
+register = template.Library()
+
+NAV_SECTIONS = ['articles', 'hot-picks', 'topics', 'authors', 'about-us']
+
+
+@register.simple_tag(takes_context=True)
+def fragment(context, name, *args):
+    return render_fragment(context['request'], name, *args)
+
+
+@register.simple_tag(takes_context=True)
+def cache_vary(context, *tags):
+    # the reader's role and the current version of each content tag, to vary
+    # {% cache %} blocks on so that purging a tag drops them
+    versions = [str(version) for version in tag_versions(tags)]
+
+    return ':'.join([reader_role(context['request'].user)] + versions)
+
+
+@register.simple_tag(takes_context=True)
+def nav_section(context):
+    # the topnav entry to highlight; the cached topnav varies on this rather
+    # than on the path, which would store a copy per page, query and cursor
+    path = context['request'].path
+    if path == '/':
+        return 'home'
+
+    for section in NAV_SECTIONS:
+        if '/' + section + '/' in path:
+            return section
+
+    return ''
+
+
+@register.simple_tag(takes_context=True)
+def want_likes(context, target_name, items):
+    # announce the articles or comments of a list before its like fragments
+    # render, so the reader's likes for all of them take a single query
+    like_states(context['request']).want(target_name, [item.id for item in items])
+    return ''
@@ -1,3 +1,1060 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+import re
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from django.utils.text import slugify
+
+from accounts.models import UserModel
+from posts.likes import toggle_like
+from posts.models import Topic, Article, Comment, Like
+from pages import context_processors
+from pages.invalidation import LAYOUT_TAG, batched_purges, purge, tag_versions
+from pages.models import TrendingScore
+from pages.page_cache import CSRF_PLACEHOLDER
+from pages.sampling import active_topic_ids, sample_topics
+from pages.search import cached_search, search_article_ids, search_key
+from pages.stampede import cached_compute
+from pages.trending import hot_articles, recompute_trending, trending_topics
+
+
+class SidebarContextProcessorsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890'
+        )
+
+        cls.topic = Topic.objects.create(
+            title='First Topic',
+            slug=slugify('First Topic', allow_unicode=False),
+            description='This is the first topic.',
+            added_by=cls.user
+        )
+
+        Article.objects.create(
+            title='First Article',
+            slug=slugify('First Article', allow_unicode=False),
+            body='This is the body of the first article.',
+            topic=cls.topic,
+            added_by=cls.user
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get('/')
+
+    def test_context_processors_are_lazy(self):
+        with self.assertNumQueries(0):
+            context_processors.random_topics(self.request)
+            context_processors.trending_topics_list(self.request)
+            context_processors.articles_objects(self.request)
+
+    def test_values_are_served_from_cache(self):
+        self.assertEqual(
+            len(context_processors.random_topics(self.request)['random_topics']), 1)
+        self.assertEqual(
+            len(context_processors.trending_topics_list(self.request)['trending_topics_list']), 1)
+        self.assertEqual(
+            len(context_processors.articles_objects(self.request)['articles_objects']), 1)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                len(context_processors.random_topics(self.request)['random_topics']), 1)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                len(context_processors.trending_topics_list(self.request)['trending_topics_list']), 1)
+            self.assertEqual(
+                len(context_processors.articles_objects(self.request)['articles_objects']), 1)
+
+    def test_cache_is_invalidated_on_save(self):
+        self.assertEqual(
+            len(context_processors.random_topics(self.request)['random_topics']), 1)
+
+        Topic.objects.create(
+            title='Second Topic',
+            slug=slugify('Second Topic', allow_unicode=False),
+            description='This is the second topic.',
+            added_by=self.user
+        )
+
+        self.assertEqual(
+            len(context_processors.random_topics(self.request)['random_topics']), 2)
+
+
+class SampleTopicsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890'
+        )
+
+        for number in range(30):
+            Topic.objects.create(
+                title='Topic ' + str(number),
+                slug=slugify('Topic ' + str(number), allow_unicode=False),
+                description='This is a topic.',
+                is_active=number != 0,
+                added_by=cls.user
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_sample_size_is_capped(self):
+        topics = sample_topics()
+        self.assertEqual(len(topics), 20)
+        self.assertEqual(len(set(topic.id for topic in topics)), 20)
+        self.assertTrue(all(topic.is_active for topic in topics))
+
+    def test_sample_fetches_only_sampled_rows(self):
+        active_topic_ids()
+
+        with self.assertNumQueries(1):
+            sample_topics()
+
+    def test_active_topic_ids_refresh_on_topic_change(self):
+        self.assertEqual(len(active_topic_ids()), 29)
+
+        topic = Topic.objects.get(slug='topic-1')
+        topic.is_active = False
+        topic.save()
+
+        self.assertEqual(len(active_topic_ids()), 28)
+
+
+class TrendingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890'
+        )
+
+        cls.quiet_topic = Topic.objects.create(
+            title='Quiet Topic',
+            slug=slugify('Quiet Topic', allow_unicode=False),
+            description='This is a quiet topic.',
+            added_by=cls.user
+        )
+        cls.busy_topic = Topic.objects.create(
+            title='Busy Topic',
+            slug=slugify('Busy Topic', allow_unicode=False),
+            description='This is a busy topic.',
+            added_by=cls.user
+        )
+
+        cls.quiet_article = Article.objects.create(
+            title='Quiet Article',
+            slug=slugify('Quiet Article', allow_unicode=False),
+            body='This is the body of the quiet article.',
+            topic=cls.quiet_topic,
+            added_by=cls.user
+        )
+        cls.busy_article = Article.objects.create(
+            title='Busy Article',
+            slug=slugify('Busy Article', allow_unicode=False),
+            body='This is the body of the busy article.',
+            topic=cls.busy_topic,
+            added_by=cls.user
+        )
+
+        for number in range(3):
+            Comment.objects.create(
+                title='Comment ' + str(number),
+                slug=slugify('Comment ' + str(number), allow_unicode=False),
+                body='This is a comment.',
+                article=cls.busy_article,
+                added_by=cls.user
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_busiest_article_and_topic_rank_first(self):
+        self.assertEqual(hot_articles('24h'), [self.busy_article, self.quiet_article])
+        self.assertEqual(trending_topics('24h'), [self.busy_topic, self.quiet_topic])
+
+    def test_scores_decay_with_age(self):
+        now = timezone.now()
+        recompute_trending(['1h'], now=now)
+        fresh = TrendingScore.objects.get(window='1h', article=self.quiet_article).score
+
+        recompute_trending(['1h'], now=now + timedelta(hours=1))
+        decayed = TrendingScore.objects.get(window='1h', article=self.quiet_article).score
+
+        self.assertAlmostEqual(decayed, fresh / 2.718281828, places=3)
+
+    def test_trending_is_served_from_precomputed_scores(self):
+        recompute_trending(['7d'])
+
+        with self.assertNumQueries(1):
+            trending_topics('7d')
+
+    def test_requests_never_recompute(self):
+        TrendingScore.objects.all().delete()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(hot_articles('24h'), [])
+
+    def test_new_activity_is_scored_in_place(self):
+        recompute_trending()
+
+        for number in range(4):
+            Comment.objects.create(
+                title='Quiet comment ' + str(number),
+                slug=slugify('Quiet comment ' + str(number), allow_unicode=False),
+                body='This is a comment.',
+                article=self.quiet_article,
+                added_by=self.user
+            )
+
+        self.assertEqual(hot_articles('24h'), [self.quiet_article, self.busy_article])
+        self.assertEqual(trending_topics('1h'), [self.quiet_topic, self.busy_topic])
+        self.assertEqual(TrendingScore.objects.filter(window='24h', article=self.quiet_article).count(), 1)
+
+        # a rebuild agrees with the scores added in place
+        recompute_trending()
+        self.assertEqual(hot_articles('24h'), [self.quiet_article, self.busy_article])
+
+    def test_likes_are_scored_by_the_rebuild(self):
+        recompute_trending()
+
+        for number in range(7):
+            liker = UserModel.objects.create(
+                username='liker' + str(number),
+                email='liker' + str(number) + '@user.com',
+                name='Liker',
+                password='1234567890'
+            )
+            toggle_like(liker, self.quiet_article)
+
+        # unliking and liking again is still one like
+        toggle_like(liker, self.quiet_article)
+        toggle_like(liker, self.quiet_article)
+
+        self.assertEqual(hot_articles('24h'), [self.busy_article, self.quiet_article])
+
+        recompute_trending()
+        self.assertEqual(hot_articles('24h'), [self.quiet_article, self.busy_article])
+        self.assertAlmostEqual(
+            TrendingScore.objects.get(window='24h', article=self.quiet_article).score, 10.0, places=2)
+
+    def test_hot_picks_view_uses_window(self):
+        response = self.client.get(reverse('pages:hot_picks'), {'window': '1h'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['window'], '1h')
+        self.assertEqual(response.context['hot_articles'][0], self.busy_article)
+
+        response = self.client.get(reverse('pages:hot_picks'), {'window': 'bogus'})
+        self.assertEqual(response.context['window'], '24h')
+
+
+class SearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890'
+        )
+
+        cls.topic = Topic.objects.create(
+            title='Space',
+            slug=slugify('Space', allow_unicode=False),
+            description='Rockets and planets.',
+            added_by=cls.user
+        )
+
+        cls.title_match = Article.objects.create(
+            title='Landing on Mars',
+            slug=slugify('Landing on Mars', allow_unicode=False),
+            body='<p>A story about a <strong>lander</strong>.</p>',
+            topic=cls.topic,
+            added_by=cls.user
+        )
+        cls.body_match = Article.objects.create(
+            title='Red planets',
+            slug=slugify('Red planets', allow_unicode=False),
+            body='<p>Mars is the fourth planet.</p>',
+            topic=cls.topic,
+            added_by=cls.user
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_results_are_ranked_by_relevance(self):
+        self.assertEqual(search_article_ids('mars'),
+                         [self.title_match.id, self.body_match.id])
+
+    def test_markup_is_not_indexed(self):
+        self.assertEqual(search_article_ids('strong'), [])
+        self.assertEqual(search_article_ids('landers'), [self.title_match.id])
+
+    def test_index_follows_saves(self):
+        self.body_match.is_active = False
+        self.body_match.save()
+        self.assertEqual(search_article_ids('mars'), [self.title_match.id])
+
+        self.title_match.title = 'Landing on Venus'
+        self.title_match.save()
+        self.assertEqual(search_article_ids('venus'), [self.title_match.id])
+
+        self.title_match.delete()
+        self.assertEqual(search_article_ids('venus'), [])
+
+    def test_topic_and_author_are_indexed(self):
+        self.assertEqual(len(search_article_ids('rockets')), 2)
+        self.assertEqual(len(search_article_ids('two')), 2)
+
+    def test_search_views(self):
+        response = self.client.get(reverse('pages:search'), {'search': 'red planet'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['results_count'], 1)
+        self.assertEqual(list(response.context['articles_objects']), [self.body_match])
+
+        response = self.client.get(
+            reverse('pages:search_pages', args=['mars', 1]))
+        self.assertEqual(response.context['results_count'], 2)
+
+    def test_queries_are_normalized(self):
+        self.assertEqual(search_key('  Red   PLANETS '), search_key('planet red'))
+
+    def test_backend_stems_the_query(self):
+        self.body_match.body = '<p>Rovers keep running on Mars.</p>'
+        self.body_match.save()
+        self.assertEqual(search_article_ids('running'), [self.body_match.id])
+        self.assertEqual(search_article_ids('runs'), [self.body_match.id])
+
+    def test_results_are_cached_until_an_article_changes(self):
+        self.assertEqual(cached_search('mars'), cached_search('Mars'))
+
+        with self.assertNumQueries(0):
+            article_ids, results_count = cached_search('MARS ')
+        self.assertEqual(results_count, 2)
+
+        self.body_match.is_active = False
+        self.body_match.save()
+        self.assertEqual(list(cached_search('mars')[0]), [self.title_match.id])
+
+    def test_rebuild_search_index_command(self):
+        call_command('rebuild_search_index', workers=1, stdout=StringIO())
+        self.assertEqual(len(search_article_ids('mars')), 2)
+
+
+class ArticlePageTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890'
+        )
+
+        cls.topic = Topic.objects.create(
+            title='First Topic',
+            slug=slugify('First Topic', allow_unicode=False),
+            description='This is the first topic.',
+            added_by=cls.user
+        )
+
+        cls.article = Article.objects.create(
+            title='First Article',
+            slug=slugify('First Article', allow_unicode=False),
+            body='This is the body of the first article.',
+            topic=cls.topic,
+            added_by=cls.user
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def add_comments(self, count):
+        for number in range(count):
+            author = UserModel.objects.create(
+                username='commenter' + str(Comment.objects.count()),
+                email='commenter' + str(Comment.objects.count()) + '@user.com',
+                name='Commenter',
+                password='1234567890'
+            )
+            Comment.objects.create(
+                title='Comment ' + str(number),
+                slug=slugify('Comment ' + str(Comment.objects.count()), allow_unicode=False),
+                body='This is a comment.',
+                article=self.article,
+                added_by=author
+            )
+
+    def get_article(self, **params):
+        return self.client.get(
+            reverse('pages:article', args=[self.article.slug]), params)
+
+    def test_query_count_does_not_grow_with_comments(self):
+        self.add_comments(2)
+        self.get_article()
+        purge(tags=[LAYOUT_TAG])
+
+        with CaptureQueriesContext(connection) as few_comments:
+            self.get_article()
+
+        self.add_comments(6)
+        self.get_article()
+        purge(tags=[LAYOUT_TAG])
+
+        with CaptureQueriesContext(connection) as many_comments:
+            self.get_article()
+
+        self.assertEqual(len(few_comments), len(many_comments))
+
+    def test_article_lists_do_not_load_bodies(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('pages:articles'))
+
+        self.assertContains(response, 'This is the body of the first article.')
+        self.assertFalse([query for query in queries
+                          if '"posts_article"."body"' in query['sql']])
+
+    def test_comments_are_paginated(self):
+        self.add_comments(12)
+
+        response = self.get_article()
+        first_page = response.context['comments_belonging_to_article']
+        self.assertEqual(len(first_page), 10)
+        self.assertTrue(first_page.has_next())
+
+        response = self.get_article(comments_cursor=first_page.next_cursor)
+        second_page = response.context['comments_belonging_to_article']
+        self.assertEqual(len(second_page), 2)
+        self.assertFalse(second_page.has_next())
+
+
+class AuthorPageTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890',
+            is_active=True
+        )
+
+        cls.topic = Topic.objects.create(
+            title='First Topic',
+            slug=slugify('First Topic', allow_unicode=False),
+            description='This is the first topic.',
+            added_by=cls.user
+        )
+
+        for number in range(12):
+            Article.objects.create(
+                title='Article ' + str(number),
+                slug=slugify('Article ' + str(number), allow_unicode=False),
+                body='This is the body of article ' + str(number) + '.',
+                topic=cls.topic,
+                added_by=cls.user
+            )
+
+        cls.comment = Comment.objects.create(
+            title='First Comment',
+            slug=slugify('First Comment', allow_unicode=False),
+            body='This is a comment.',
+            article=Article.objects.get(slug='article-0'),
+            added_by=cls.user
+        )
+
+        Like.objects.create(
+            slug=slugify('First Like', allow_unicode=False),
+            comment=cls.comment,
+            added_by=cls.user
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def get_author(self, **params):
+        return self.client.get(
+            reverse('pages:author', args=[self.user.username]), params)
+
+    def test_only_the_selected_tab_is_loaded_and_paginated(self):
+        response = self.get_author()
+        self.assertEqual(response.context['tab'], 'articles')
+        self.assertEqual(len(response.context['activities']), 10)
+
+        response = self.get_author(
+            tab='articles', cursor=response.context['activities'].next_cursor)
+        self.assertEqual(len(response.context['activities']), 2)
+
+        response = self.get_author(tab='bogus')
+        self.assertEqual(response.context['tab'], 'articles')
+
+    def test_tabs_render_as_fragments(self):
+        response = self.get_author(tab='likes', fragment=1)
+        self.assertTemplateUsed(response, 'includes/author_activities.html')
+        self.assertTemplateNotUsed(response, 'pages/author.html')
+        self.assertContains(response, 'Liked comment')
+        self.assertContains(
+            response, reverse('pages:article', args=[self.comment.article.slug]))
+
+        response = self.get_author(tab='comments', fragment=1)
+        self.assertContains(response, 'First Comment')
+
+    def test_likes_tab_lists_current_likes_of_articles_and_comments(self):
+        Like.objects.create(
+            slug=slugify('Topic Like', allow_unicode=False),
+            topic=self.topic,
+            added_by=self.user
+        )
+        Like.objects.create(
+            slug=slugify('Withdrawn Like', allow_unicode=False),
+            article=Article.objects.get(slug='article-1'),
+            added_by=self.user,
+            like_dislike=False
+        )
+
+        response = self.get_author(tab='likes')
+        self.assertEqual([like.comment for like in response.context['activities']], [self.comment])
+
+    def test_authors_page_links_to_tabs(self):
+        response = self.client.get(reverse('pages:authors'))
+        self.assertContains(
+            response, reverse('pages:author', args=[self.user.username]) + '?tab=likes')
+
+    def test_query_count_does_not_grow_with_activity(self):
+        self.get_author(tab='likes')
+
+        with CaptureQueriesContext(connection) as one_like:
+            self.get_author(tab='likes')
+
+        for article in Article.objects.all():
+            Like.objects.create(
+                slug=slugify('Like ' + article.slug, allow_unicode=False),
+                article=article,
+                added_by=self.user
+            )
+
+        with CaptureQueriesContext(connection) as many_likes:
+            self.get_author(tab='likes')
+
+        self.assertEqual(len(one_like), len(many_likes))
+
+
+class PageCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890',
+            is_active=True
+        )
+
+        cls.topic = Topic.objects.create(
+            title='First Topic',
+            slug=slugify('First Topic', allow_unicode=False),
+            description='This is the first topic.',
+            added_by=cls.user
+        )
+
+        cls.article = Article.objects.create(
+            title='First Article',
+            slug=slugify('First Article', allow_unicode=False),
+            body='This is the body of the first article.',
+            topic=cls.topic,
+            added_by=cls.user
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def get_article(self):
+        return self.client.get(reverse('pages:article', args=[self.article.slug]))
+
+    def test_anonymous_pages_are_served_from_cache(self):
+        self.client.get(reverse('pages:topics'))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('pages:topics'))
+
+        self.assertContains(response, 'First Topic')
+
+    def test_cache_is_invalidated_on_change(self):
+        self.get_article()
+
+        Comment.objects.create(
+            title='First Comment',
+            slug=slugify('First Comment', allow_unicode=False),
+            body='This is a new comment.',
+            article=self.article,
+            added_by=self.user
+        )
+
+        self.assertContains(self.get_article(), 'This is a new comment.')
+
+    def test_signed_in_readers_get_their_own_fragments(self):
+        Like.objects.create(
+            slug=slugify('First Like', allow_unicode=False),
+            article=self.article,
+            added_by=self.user
+        )
+        self.assertContains(self.get_article(), 'Sign-up')
+
+        self.client.force_login(self.user)
+        response = self.get_article()
+        self.assertContains(response, 'Hi<span class="fw-bold"> User Two')
+        self.assertContains(response, 'Unlike')
+
+        self.client.logout()
+        response = self.get_article()
+        self.assertContains(response, 'Sign-up')
+        self.assertNotContains(response, 'Unlike')
+
+    def test_marker_syntax_in_bodies_is_left_alone(self):
+        body = '<!--fragment:nope--><!--/fragment--> <!--fragment:article_like:x:y-->liked<!--/fragment-->'
+        Article.objects.filter(pk=self.article.pk).update(body=body)
+        self.get_article()
+
+        self.client.force_login(self.user)
+        response = self.get_article()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, body)
+
+    def test_cached_forms_carry_a_valid_csrf_token(self):
+        self.get_article()
+
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        response = client.get(reverse('pages:article', args=[self.article.slug]))
+        self.assertNotContains(response, CSRF_PLACEHOLDER)
+
+        token = re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"',
+                          response.content.decode()).group(1)
+        response = client.post(reverse('pages:article', args=[self.article.slug]), {
+            'csrfmiddlewaretoken': token,
+            'title': 'A comment',
+            'body': 'This is a comment.'
+        })
+        self.assertEqual(response.status_code, 302)
+
+
+class LikeStateTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890',
+            is_active=True
+        )
+
+        cls.topic = Topic.objects.create(
+            title='First Topic',
+            slug=slugify('First Topic', allow_unicode=False),
+            description='This is the first topic.',
+            added_by=cls.user
+        )
+
+        cls.articles = [Article.objects.create(
+            title='Article ' + str(number),
+            slug=slugify('Article ' + str(number), allow_unicode=False),
+            body='This is the body of article ' + str(number) + '.',
+            topic=cls.topic,
+            added_by=cls.user
+        ) for number in range(5)]
+
+        for article in cls.articles[:2]:
+            Like.objects.create(
+                slug=slugify('Like ' + article.slug, allow_unicode=False),
+                article=article,
+                added_by=cls.user
+            )
+
+        cls.comments = [Comment.objects.create(
+            title='Comment ' + str(number),
+            slug=slugify('Comment ' + str(number), allow_unicode=False),
+            body='This is a comment.',
+            article=cls.articles[0],
+            added_by=cls.user
+        ) for number in range(3)]
+
+        Like.objects.create(
+            slug=slugify('Like ' + cls.comments[0].slug, allow_unicode=False),
+            comment=cls.comments[0],
+            added_by=cls.user
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def like_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        # the reader's own likes, not the trending counts
+        return response, [query for query in queries
+                          if '"posts_like"."added_by_id" =' in query['sql']]
+
+    def test_lists_look_up_like_state_in_one_query(self):
+        self.client.force_login(self.user)
+
+        for url in [reverse('pages:articles'), reverse('pages:articles'), reverse('pages:hot_picks')]:
+            response, queries = self.like_queries(url)
+
+            self.assertEqual(len(queries), 1)
+            self.assertContains(response, 'Unlike', count=2)
+
+    def test_comment_like_state_is_looked_up_in_one_query(self):
+        self.client.force_login(self.user)
+
+        response, queries = self.like_queries(
+            reverse('pages:article', args=[self.articles[0].slug]))
+
+        self.assertEqual(len([query for query in queries if 'comment_id" IN' in query['sql']]), 1)
+        self.assertContains(response, 'Unlike', count=2)
+
+    def test_anonymous_readers_need_no_lookup(self):
+        response, queries = self.like_queries(reverse('pages:articles'))
+
+        self.assertEqual(queries, [])
+        self.assertNotContains(response, 'Unlike')
+
+
+class InvalidationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890',
+            is_active=True
+        )
+
+        cls.topic = Topic.objects.create(
+            title='First Topic',
+            slug=slugify('First Topic', allow_unicode=False),
+            description='This is the first topic.',
+            added_by=cls.user
+        )
+
+        cls.other_topic = Topic.objects.create(
+            title='Second Topic',
+            slug=slugify('Second Topic', allow_unicode=False),
+            description='This is the second topic.',
+            added_by=cls.user
+        )
+
+        cls.article = Article.objects.create(
+            title='First Article',
+            slug=slugify('First Article', allow_unicode=False),
+            body='This is the body of the first article.',
+            topic=cls.topic,
+            added_by=cls.user
+        )
+
+        cls.other_article = Article.objects.create(
+            title='Second Article',
+            slug=slugify('Second Article', allow_unicode=False),
+            body='This is the body of the second article.',
+            topic=cls.other_topic,
+            added_by=cls.user
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def tag_version(self, tag):
+        return tag_versions([tag])[0]
+
+    def test_comment_purges_only_its_article_page(self):
+        self.client.get(reverse('pages:article', args=[self.article.slug]))
+        self.client.get(reverse('pages:article', args=[self.other_article.slug]))
+
+        Comment.objects.create(
+            title='First Comment',
+            slug=slugify('First Comment', allow_unicode=False),
+            body='This is a comment.',
+            article=self.article,
+            added_by=self.user
+        )
+
+        # only the conditional GET validator is read
+        with self.assertNumQueries(1):
+            self.client.get(reverse('pages:article', args=[self.other_article.slug]))
+
+        self.assertContains(
+            self.client.get(reverse('pages:article', args=[self.article.slug])), 'This is a comment.')
+
+    def test_article_purges_its_pages_and_lists(self):
+        versions = {tag: self.tag_version(tag) for tag in (
+            'articles', 'article:first-article', 'article:second-article',
+            'topic:first-topic', 'topic:second-topic', 'author:user2', 'authors')}
+
+        self.article.title = 'First Article Renamed'
+        self.article.save()
+
+        changed = {tag for tag, version in versions.items() if self.tag_version(tag) != version}
+        self.assertEqual(changed, {'articles', 'article:first-article', 'topic:first-topic', 'author:user2'})
+
+    def test_moved_article_purges_its_previous_topic(self):
+        version = self.tag_version('topic:first-topic')
+
+        article = Article.objects.get(pk=self.article.pk)
+        article.topic = self.other_topic
+        article.save()
+
+        self.assertNotEqual(self.tag_version('topic:first-topic'), version)
+
+    def test_author_counters_purge_only_author_pages(self):
+        version = self.tag_version('article:second-article')
+
+        toggle_like(self.user, self.article)
+
+        self.assertEqual(self.tag_version('article:second-article'), version)
+
+    def test_logins_do_not_purge_author_pages(self):
+        version = self.tag_version('author:user2')
+        self.client.force_login(self.user)
+        self.assertEqual(self.tag_version('author:user2'), version)
+
+    def test_purges_are_batched(self):
+        with mock.patch('pages.invalidation.purge_now') as purge_now:
+            with batched_purges():
+                for number in range(5):
+                    Comment.objects.create(
+                        title='Comment ' + str(number),
+                        slug=slugify('Comment ' + str(number), allow_unicode=False),
+                        body='This is a comment.',
+                        article=self.article,
+                        added_by=self.user
+                    )
+
+        purge_now.assert_called_once()
+        self.assertEqual(purge_now.call_args.args[1], {'article:first-article', 'author:user2'})
+
+
+class StampedeTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.compute = mock.Mock(return_value='fresh')
+
+    def test_expired_value_is_served_while_another_worker_refreshes(self):
+        cache.set('key', ('stale', 1.0, time.time() - 1), 60)
+        cache.add('key:lock', True)
+
+        self.assertEqual(cached_compute('key', self.compute, 60), 'stale')
+        self.compute.assert_not_called()
+
+    def test_expired_value_is_refreshed_by_one_worker(self):
+        cache.set('key', ('stale', 1.0, time.time() - 1), 60)
+
+        self.assertEqual(cached_compute('key', self.compute, 60), 'fresh')
+        self.assertEqual(cached_compute('key', self.compute, 60), 'fresh')
+        self.compute.assert_called_once()
+        self.assertIsNone(cache.get('key:lock'))
+
+    def test_hot_keys_expire_early(self):
+        cache.set('key', ('cached', 1.0, time.time() + 5), 60)
+
+        with mock.patch('pages.stampede.random.random', return_value=0.0):
+            self.assertEqual(cached_compute('key', self.compute, 60), 'cached')
+
+        with mock.patch('pages.stampede.random.random', return_value=0.999):
+            self.assertEqual(cached_compute('key', self.compute, 60), 'fresh')
+
+    def test_missing_value_waits_for_the_worker_computing_it(self):
+        cache.add('key:lock', True)
+
+        def other_worker_finishes(seconds):
+            cache.set('key', ('computed elsewhere', 1.0, time.time() + 60), 60)
+
+        with mock.patch('pages.stampede.time.sleep', side_effect=other_worker_finishes):
+            self.assertEqual(cached_compute('key', self.compute, 60), 'computed elsewhere')
+
+        self.compute.assert_not_called()
+
+
+class LayoutFragmentCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890',
+            is_active=True
+        )
+
+        cls.staff = UserModel.objects.create(
+            username='user3',
+            email='user3@user3.com',
+            name='User Three',
+            password='1234567890',
+            is_active=True,
+            is_staff=True
+        )
+
+        cls.topic = Topic.objects.create(
+            title='First Topic',
+            slug=slugify('First Topic', allow_unicode=False),
+            description='This is the first topic.',
+            added_by=cls.user
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_layout_is_not_rendered_again(self):
+        self.client.get(reverse('pages:search'))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('pages:search'))
+
+        self.assertContains(response, 'First Topic')
+        self.assertFalse([query for query in queries if 'FROM "posts_topic"' in query['sql']])
+
+    def test_topnav_is_cached_per_section(self):
+        for query in ('first', 'second', 'third'):
+            self.client.get(reverse('pages:search'), {'search': query})
+        response = self.client.get(reverse('pages:articles'))
+
+        self.assertContains(
+            response, 'href="' + reverse('pages:articles') + '" class="nav-link px-2 text-secondary"')
+        self.assertEqual(len([key for key in cache._cache if 'topnav_links' in key]), 2)
+
+    def test_layout_follows_topic_changes(self):
+        self.client.get(reverse('pages:search'))
+
+        self.topic.title = 'Renamed Topic'
+        self.topic.save()
+
+        self.assertContains(self.client.get(reverse('pages:search')), 'Renamed Topic')
+
+    def test_dashboard_navigation_is_cached_per_role_and_author(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('accounts:dashboard'))
+        self.assertNotContains(response, reverse('posts:authors'))
+
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('accounts:dashboard'))
+        self.assertContains(response, reverse('posts:authors'))
+        self.assertContains(response, 'User Three')
+
+        self.staff.name = 'Renamed Staff'
+        self.staff.save()
+        self.assertContains(self.client.get(reverse('accounts:dashboard')), 'Renamed Staff')
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890',
+            is_active=True
+        )
+
+        cls.topic = Topic.objects.create(
+            title='First Topic',
+            slug=slugify('First Topic', allow_unicode=False),
+            description='This is the first topic.',
+            added_by=cls.user
+        )
+
+        cls.article = Article.objects.create(
+            title='First Article',
+            slug=slugify('First Article', allow_unicode=False),
+            body='This is the body of the first article.',
+            topic=cls.topic,
+            added_by=cls.user
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('pages:article', args=[self.article.slug])
+
+    def test_unchanged_pages_are_not_modified(self):
+        for url in (self.url, reverse('pages:topic', args=[self.topic.slug]),
+                    reverse('pages:author', args=[self.user.username])):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('no-cache', response['Cache-Control'])
+
+            self.assertEqual(self.client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+            self.assertEqual(self.client.get(
+                url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304)
+
+    def test_not_modified_skips_rendering(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_comments_and_likes_change_the_validators(self):
+        etag = self.client.get(self.url)['ETag']
+
+        Like.objects.create(
+            slug=slugify('First Like', allow_unicode=False),
+            article=self.article,
+            added_by=self.user
+        )
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_validators_differ_per_reader(self):
+        etag = self.client.get(self.url)['ETag']
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_logging_in_again_changes_the_validators(self):
+        self.user.set_password('averylongpassword')
+        self.user.save()
+
+        self.client.get(self.url)
+        self.client.post(reverse('accounts:login'), {
+            'username': 'user2', 'password': 'averylongpassword'})
+        response = self.client.get(self.url)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        self.user.refresh_from_db()
+        self.assertEqual(last_modified, http_date(self.user.last_login.timestamp()))
+
+        self.client.post(reverse('accounts:logout'))
+        self.client.post(reverse('accounts:login'), {
+            'username': 'user2', 'password': 'averylongpassword'})
+
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=etag, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Cookie', response['Vary'])
@@ -0,0 +1,152 @@
+from collections import defaultdict
+from datetime import timedelta
+import heapq
+import math
+
+from django.db import transaction
+from django.db.models import F, Min, Q
+from django.utils import timezone
+from posts.models import Article, Comment, Like
+from .models import TrendingScore
+
+
+WINDOWS = {
+    '1h': timedelta(hours=1),
+    '24h': timedelta(hours=24),
+    '7d': timedelta(days=7),
+}
+DEFAULT_WINDOW = '24h'
+
+# how much a single event counts towards the score of its article and topic
+ACTIVITY_WEIGHTS = {
+    'article': 3.0,
+    'comment': 2.0,
+    'like': 1.0,
+}
+
+# events older than this many windows contribute less than 1% and are skipped
+HORIZON_FACTOR = 5
+STORED_PER_WINDOW = 100
+CHUNK_SIZE = 2000
+# events further than this many lifetimes past the last rebuild would grow
+# the stored scores out of float range; they wait for the next rebuild
+MAX_GROWTH = 500
+
+
+def resolve_window(window):
+    return window if window in WINDOWS else DEFAULT_WINDOW
+
+
+def activity_events(since):
+    articles = Article.objects.filter(
+        created_at__gte=since, is_active=True).values_list('id', 'topic_id', 'created_at')
+
+    comments = Comment.objects.filter(
+        created_at__gte=since, is_active=True, article__is_active=True).values_list(
+        'article_id', 'article__topic_id', 'created_at')
+
+    likes = Like.objects.filter(
+        created_at__gte=since, like_dislike=True, is_active=True, article__is_active=True).values_list(
+        'article_id', 'article__topic_id', 'created_at')
+
+    for kind, events in (('article', articles), ('comment', comments), ('like', likes)):
+        weight = ACTIVITY_WEIGHTS[kind]
+        for article_id, topic_id, created_at in events.order_by().iterator(chunk_size=CHUNK_SIZE):
+            yield weight, article_id, topic_id, created_at
+
+
+def compute_scores(window, now):
+    lifetime = WINDOWS[window].total_seconds()
+    since = now - WINDOWS[window] * HORIZON_FACTOR
+
+    article_scores = defaultdict(float)
+    topic_scores = defaultdict(float)
+
+    for weight, article_id, topic_id, created_at in activity_events(since):
+        score = weight * math.exp(-(now - created_at).total_seconds() / lifetime)
+        article_scores[article_id] += score
+        topic_scores[topic_id] += score
+
+    return article_scores, topic_scores
+
+
+def recompute_trending(windows=None, now=None):
+    now = now or timezone.now()
+
+    for window in windows or WINDOWS:
+        article_scores, topic_scores = compute_scores(window, now)
+
+        scores = [
+            TrendingScore(window=window, article_id=article_id,
+                          score=score, computed_at=now)
+            for article_id, score in heapq.nlargest(
+                STORED_PER_WINDOW, article_scores.items(), key=lambda item: item[1])
+        ] + [
+            TrendingScore(window=window, topic_id=topic_id,
+                          score=score, computed_at=now)
+            for topic_id, score in heapq.nlargest(
+                STORED_PER_WINDOW, topic_scores.items(), key=lambda item: item[1])
+        ]
+
+        with transaction.atomic():
+            TrendingScore.objects.filter(window=window).delete()
+            TrendingScore.objects.bulk_create(scores, batch_size=500)
+
+
+def record_activity(kind, article_id, topic_id, created_at):
+    """
+    Add one event to the stored scores of its article and topic in every
+    window, as it happens.
+
+    Scores use forward decay: within a window every score is relative to the
+    time of the last rebuild (computed_at), to which an event at t adds
+    weight * exp((t - computed_at) / lifetime). All scores of a window share
+    that time, so their order is the order of the decayed scores and new
+    events can be added in place. recompute_trending rebuilds the windows
+    from scratch on a schedule, moving computed_at forward. Likes are only
+    counted by the rebuild, which sees each Like row once however often it
+    is toggled.
+    """
+
+    epochs = dict(TrendingScore.objects.values('window').annotate(
+        epoch=Min('computed_at')).values_list('window', 'epoch'))
+
+    increments = {}
+    for window, span in WINDOWS.items():
+        epoch = epochs.get(window, created_at)
+        growth = (created_at - epoch).total_seconds() / span.total_seconds()
+
+        if growth <= MAX_GROWTH:
+            increments[window] = (epoch, ACTIVITY_WEIGHTS[kind] * math.exp(growth))
+
+    with transaction.atomic():
+        TrendingScore.objects.bulk_create([
+            TrendingScore(window=window, score=0, computed_at=epoch, **target)
+            for window, (epoch, increment) in increments.items()
+            for target in ({'article_id': article_id}, {'topic_id': topic_id})
+        ], ignore_conflicts=True)
+
+        for window, (epoch, increment) in increments.items():
+            TrendingScore.objects.filter(
+                Q(article_id=article_id) | Q(topic_id=topic_id), window=window).update(
+                score=F('score') + increment)
+
+
+def trending_topics(window=DEFAULT_WINDOW, limit=20):
+    window = resolve_window(window)
+
+    scores = TrendingScore.objects.filter(
+        window=window, topic__isnull=False, topic__is_active=True).select_related(
+        'topic').order_by('-score')[:limit]
+
+    return [score.topic for score in scores]
+
+
+def hot_articles(window=DEFAULT_WINDOW, limit=20):
+    window = resolve_window(window)
+
+    scores = TrendingScore.objects.filter(
+        window=window, article__isnull=False, article__is_active=True).select_related(
+        'article__topic', 'article__added_by').defer('article__body').order_by('-score')[:limit]
+
+    return [score.article for score in scores]
@@ -26,7 +26,7 @@ urlpatterns = [
          views.authors_pages, name='authors_pages'),
 
     path('search/', views.search, name='search'),
-    path('search/<slug:query>/pages=<int:page>/',
+    path('search/<str:query>/pages=<int:page>/',
          views.search_pages, name='search_pages'),
 
     path('about-us/', TemplateView.as_view(
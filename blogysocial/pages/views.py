@@ -1,46 +1,54 @@
 from datetime import datetime
-import random
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
-from django.db.models import Q
+from django.db import transaction
 from django.http import HttpResponse, HttpResponseRedirect
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 from django.utils.text import slugify
 
 from accounts.models import UserModel
-from posts.models import Topic, Article, Comment, Like
+from posts.models import Topic, Article, Comment
+from posts.counters import increment_counters
+from posts.featured import featured_article as get_featured_article
 from posts.forms import CommentForm
+from posts.activities import author_activities
+from posts.pagination import paginate
+from .conditional import conditional_page
+from .page_cache import cached_page
+from .sampling import sample_topics
+from .search import cached_search
+from .trending import WINDOWS, hot_articles, resolve_window, trending_topics
 
 
-def index(request):
-    topics = Topic.objects.filter(is_active=True)
-    topics_list = list(topics)
+def article_updated_at(article_slug):
+    return Article.objects.filter(
+        slug=article_slug, is_active=True).values_list('updated_at', flat=True).first()
 
-    if topics.count() < 20:
-        minimum_count = topics.count()
-    elif topics.count() < 1:
-        minimum_count = 0
-    else:
-        minimum_count = 20
 
-    random_topics = random.sample(topics_list, minimum_count)
+def topic_updated_at(topic_slug):
+    return Topic.objects.filter(
+        slug=topic_slug, is_active=True).values_list('updated_at', flat=True).first()
+
 
-    featured_article = Article.objects.get(is_featured=True)
+def author_updated_at(username):
+    return UserModel.objects.filter(
+        username=username, is_active=True).values_list('updated_at', flat=True).first()
+
+
+@cached_page('articles')
+def index(request):
+    random_topics = sample_topics()
 
-    articles = Article.objects.filter(is_active=True).order_by('-created_at')
+    featured_article = get_featured_article()
 
-    latest_articles_for_trending_topics = list(
-        set(Article.objects.values_list('topic__title', flat=True).order_by('-created_at')[:100]))
+    articles = Article.objects.filter(is_active=True).order_by('-created_at').as_rows()
 
-    trending_topics_list = Topic.objects.filter(
-        title__in=latest_articles_for_trending_topics, is_active=True).order_by('-created_at')
+    trending_topics_list = trending_topics()
 
-    paginator = Paginator(articles, per_page=10)
-    articles_objects = paginator.get_page(1)
-    articles_objects.adjusted_elided_pages = paginator.get_elided_page_range(1)
+    articles_objects = paginate(request, articles, 1)
 
     return render(request, 'pages/index.html', {
         'random_topics': random_topics,
@@ -50,33 +58,17 @@ def index(request):
     })
 
 
+@cached_page('articles')
 def index_pages(request, page=1):
-    topics = Topic.objects.filter(is_active=True)
-    topics_list = list(topics)
+    random_topics = sample_topics()
 
-    if topics.count() < 20:
-        minimum_count = topics.count()
-    elif topics.count() < 1:
-        minimum_count = 0
-    else:
-        minimum_count = 20
-
-    random_topics = random.sample(topics_list, minimum_count)
-
-    featured_article = Article.objects.get(is_featured=True)
+    featured_article = get_featured_article()
 
-    articles = Article.objects.filter(is_active=True).order_by('-created_at')
+    articles = Article.objects.filter(is_active=True).order_by('-created_at').as_rows()
 
-    latest_articles_for_trending_topics = list(
-        set(Article.objects.values_list('topic__title', flat=True).order_by('-created_at')[:100]))
+    trending_topics_list = trending_topics()
 
-    trending_topics_list = Topic.objects.filter(
-        title__in=latest_articles_for_trending_topics, is_active=True).order_by('-created_at')
-
-    paginator = Paginator(articles, per_page=10)
-    articles_objects = paginator.get_page(page)
-    articles_objects.adjusted_elided_pages = paginator.get_elided_page_range(
-        page)
+    articles_objects = paginate(request, articles, page)
 
     return render(request, 'pages/index.html', {
         'random_topics': random_topics,
@@ -86,45 +78,32 @@ def index_pages(request, page=1):
     })
 
 
+@cached_page('articles')
 def articles(request):
-    articles = Article.objects.filter(is_active=True).order_by('-created_at')
+    articles = Article.objects.filter(is_active=True).order_by('-created_at').as_rows()
 
-    paginator = Paginator(articles, per_page=10)
-    articles_objects = paginator.get_page(1)
-    articles_objects.adjusted_elided_pages = paginator.get_elided_page_range(1)
+    articles_objects = paginate(request, articles, 1)
 
     return render(request, 'pages/articles.html', {'articles_objects': articles_objects})
 
 
+@cached_page('articles')
 def articles_pages(request, page=1):
-    articles = Article.objects.filter(is_active=True).order_by('-created_at')
+    articles = Article.objects.filter(is_active=True).order_by('-created_at').as_rows()
 
-    paginator = Paginator(articles, per_page=10)
-    articles_objects = paginator.get_page(page)
-    articles_objects.adjusted_elided_pages = paginator.get_elided_page_range(
-        page)
+    articles_objects = paginate(request, articles, page)
 
     return render(request, 'pages/articles.html', {'articles_objects': articles_objects})
 
 
+@conditional_page(article_updated_at, 'article:{article_slug}')
+@cached_page('article:{article_slug}')
 def article(request, article_slug):
     article = get_object_or_404(
-        Article, slug=article_slug, is_active=True)
-
-    if request.user.is_authenticated:
-        article_like = Like.objects.filter(like_dislike=True,
-                                           article=article, added_by=request.user).exists()
-    else:
-        article_like = None
-
-    comments_belonging_to_article = Comment.objects.filter(
-        article=article, is_active=True).order_by('-updated_at')
-
-    likes_belonging_to_article = Like.objects.filter(
-        like_dislike=True, article=article, is_active=True).order_by('-updated_at')
+        Article.objects.select_related('topic', 'added_by'), slug=article_slug, is_active=True)
 
-    comments_count = comments_belonging_to_article.count()
-    likes_count = likes_belonging_to_article.count()
+    comments_count = article.comments_count
+    likes_count = article.likes_count
 
     if request.method == 'POST':
         comment_form = CommentForm(request.POST)
@@ -138,7 +117,12 @@ def article(request, article_slug):
             comment.body = comment_form.cleaned_data['body']
             comment.article = article
             comment.added_by = request.user
-            comment.save()
+
+            with transaction.atomic():
+                comment.save()
+                increment_counters(Article, article.pk, comments_count=1)
+                increment_counters(
+                    UserModel, request.user.pk, comments_count=1)
 
             messages.success(request, comment.title + ' added')
 
@@ -149,31 +133,38 @@ def article(request, article_slug):
     else:
         comment_form = CommentForm()
 
+    comments = Comment.objects.filter(
+        article=article, is_active=True).select_related('added_by')
+
+    comments_belonging_to_article = paginate(
+        request, comments, 1, ordering=('-updated_at', '-id'), cursor_param='comments_cursor')
+
     return render(request, 'pages/article.html', {
         'article': article,
-        'article_like': article_like,
         'comments_belonging_to_article': comments_belonging_to_article,
         'comments_count': comments_count,
         'comment_form': comment_form,
-        'likes_belonging_to_article': likes_belonging_to_article,
         'likes_count': likes_count
     })
 
 
+@cached_page()
 def topics(request):
     topics = Topic.objects.filter(is_active=True).order_by('-created_at')
 
     return render(request, 'pages/topics.html', {'topics': topics})
 
 
+@conditional_page(topic_updated_at, 'topic:{topic_slug}')
+@cached_page('topic:{topic_slug}')
 def topic(request, topic_slug):
     topic = get_object_or_404(
         Topic, slug=topic_slug, is_active=True)
 
     articles_belonging_to_topic = Article.objects.filter(
-        topic=topic, is_active=True).order_by('-updated_at')
+        topic=topic, is_active=True).order_by('-updated_at').as_rows()
 
-    articles_count = articles_belonging_to_topic.count()
+    articles_count = topic.articles_count
 
     return render(request, 'pages/topic.html', {
         'topic': topic,
@@ -182,14 +173,15 @@ def topic(request, topic_slug):
     })
 
 
+@cached_page('articles')
 def hot_picks(request):
-    latest_comments_for_hot_articles = list(
-        set(Comment.objects.values_list('article__title', flat=True).order_by('-created_at')[:100]))
+    window = resolve_window(request.GET.get('window'))
 
-    hot_articles = Article.objects.filter(
-        title__in=latest_comments_for_hot_articles, is_active=True).order_by('-created_at')
-
-    return render(request, 'pages/hot_picks.html', {'hot_articles': hot_articles})
+    return render(request, 'pages/hot_picks.html', {
+        'hot_articles': hot_articles(window),
+        'window': window,
+        'windows': WINDOWS
+    })
 
     # def commented_on_recently(self):
     #     # return self.pub_date >= timezone.now() - datetime.timedelta(days=1)
@@ -219,111 +211,77 @@ def hot_picks(request):
     # comments = Comment.objects.filter(created_at__range=[date.today(), date.today() + timedelta(days=2)])
 
 
-def search(request):
-    if request.method == 'GET':
-
-        query = request.GET.get('search')
-
-        articles = Article.objects.filter(
-            Q(title__icontains=query) |
-            Q(body__icontains=query) |
-            Q(topic__title__icontains=query) |
-            Q(topic__description__icontains=query) |
-            Q(added_by__name__icontains=query),
-            is_active=True
-        )
+def search_results(request, query, page):
+    article_ids, results_count = cached_search(query)
 
-        results_count = articles.count()
+    paginator = Paginator(article_ids, per_page=10)
+    paginator.count = results_count
+    articles_objects = paginator.get_page(page)
+    articles_objects.adjusted_elided_pages = paginator.get_elided_page_range(
+        articles_objects.number)
 
-        paginator = Paginator(articles, per_page=10)
-        articles_objects = paginator.get_page(1)
-        articles_objects.adjusted_elided_pages = paginator.get_elided_page_range(
-            1)
+    articles = {article.id: article for article in Article.objects.filter(
+        id__in=articles_objects.object_list).as_rows()}
+    articles_objects.object_list = [
+        articles[article_id] for article_id in articles_objects.object_list if article_id in articles]
 
     return render(request, 'pages/search.html', {
         'query': query,
         'articles_objects': articles_objects,
-        'results_count': results_count
+        'results_count': paginator.count
     })
 
 
-def search_pages(request, query, page=1):
+def search(request):
+    query = request.GET.get('search', '')
 
-    articles = Article.objects.filter(
-        Q(title__icontains=query) |
-        Q(body__icontains=query) |
-        Q(topic__title__icontains=query) |
-        Q(topic__description__icontains=query) |
-        Q(added_by__name__icontains=query)
-    )
+    return search_results(request, query, 1)
 
-    results_count = articles.count()
 
-    paginator = Paginator(articles, per_page=10)
-    articles_objects = paginator.get_page(page)
-    articles_objects.adjusted_elided_pages = paginator.get_elided_page_range(
-        page)
-
-    return render(request, 'pages/search.html', {
-        'query': query,
-        'articles_objects': articles_objects,
-        'results_count': results_count
-    })
+def search_pages(request, query, page=1):
+    return search_results(request, query, page)
 
 
+@cached_page('authors')
 def authors(request):
     authors = UserModel.objects.filter(is_active=True).order_by('-created_at')
 
-    paginator = Paginator(authors, per_page=10)
-    authors_objects = paginator.get_page(1)
-    authors_objects.adjusted_elided_pages = paginator.get_elided_page_range(1)
+    authors_objects = paginate(request, authors, 1)
 
     return render(request, 'pages/authors.html', {'authors_objects': authors_objects})
 
 
+@cached_page('authors')
 def authors_pages(request, page=1):
     authors = UserModel.objects.filter(is_active=True).order_by('-created_at')
 
-    paginator = Paginator(authors, per_page=10)
-    authors_objects = paginator.get_page(page)
-    authors_objects.adjusted_elided_pages = paginator.get_elided_page_range(
-        page)
+    authors_objects = paginate(request, authors, page)
 
     return render(request, 'pages/authors.html', {'authors_objects': authors_objects})
 
 
+@conditional_page(author_updated_at, 'author:{username}')
 def author(request, username):
     author = get_object_or_404(
         UserModel, username=username, is_active=True)
 
-    topics_by_author = Topic.objects.filter(
-        added_by=author, is_active=True).order_by('-updated_at')
-
-    articles_by_author = Article.objects.filter(
-        added_by=author, is_active=True).order_by('-updated_at')
-
-    comments_by_author = Comment.objects.filter(
-        added_by=author, is_active=True).order_by('-updated_at')
+    tab, activities = author_activities(request, author)
 
-    likes_by_author = Like.objects.filter(
-        added_by=author, is_active=True).order_by('-updated_at')
-
-    topics_count = topics_by_author.count()
-    articles_count = articles_by_author.count()
-    comments_count = comments_by_author.count()
-    likes_count = likes_by_author.count()
-
-    return render(request, 'pages/author.html', {
+    context = {
         'author': author,
-        'topics_by_author': topics_by_author,
-        'articles_by_author': articles_by_author,
-        'comments_by_author': comments_by_author,
-        'likes_by_author': likes_by_author,
-        'topics_count': topics_count,
-        'articles_count': articles_count,
-        'comments_count': comments_count,
-        'likes_count': likes_count
-    })
+        'tab': tab,
+        'activities': activities,
+        'article_url': 'pages:article',
+        'topics_count': author.topics_count,
+        'articles_count': author.articles_count,
+        'comments_count': author.comments_count,
+        'likes_count': author.likes_count
+    }
+
+    if request.GET.get('fragment'):
+        return render(request, 'includes/author_activities.html', context)
+
+    return render(request, 'pages/author.html', context)
 
 
 # def reaction_on_article(request, article_slug, reaction):
@@ -0,0 +1,31 @@
+from django.db.models import Q
+
+from .models import Article, Comment, Like
+from .pagination import paginate
+
+
+AUTHOR_TABS = ('articles', 'comments', 'likes')
+
+
+def author_activities(request, author, per_page=10):
+    # only the selected tab is queried; the others are fetched as fragments
+    # when opened (see static/js/author-activities.js)
+    tab = request.GET.get('tab')
+
+    if tab not in AUTHOR_TABS:
+        tab = AUTHOR_TABS[0]
+
+    if tab == 'articles':
+        activities = Article.objects.filter(
+            added_by=author, is_active=True).as_rows()
+    elif tab == 'comments':
+        activities = Comment.objects.filter(
+            added_by=author, is_active=True).select_related('article')
+    else:
+        # withdrawn likes and topic likes have nothing to show
+        activities = Like.objects.filter(
+            Q(article__isnull=False) | Q(comment__isnull=False),
+            added_by=author, like_dislike=True, is_active=True).select_related(
+                'article', 'comment__article').defer('article__body', 'comment__article__body')
+
+    return tab, paginate(request, activities, 1, per_page=per_page, ordering=('-updated_at', '-id'))
@@ -0,0 +1,45 @@
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from accounts.models import UserModel
+from .models import Topic, Article, Comment, Like
+from .signals import counters_changed
+
+
+def increment_counters(model, pk, **deltas):
+    # a single UPDATE ... SET field = field + delta, so concurrent requests
+    # never overwrite each other's counts
+    model.objects.filter(pk=pk).update(
+        **{field: F(field) + delta for field, delta in deltas.items()})
+    counters_changed.send(sender=model, pk=pk)
+
+
+def count_of(queryset, field):
+    counts = queryset.filter(**{field: OuterRef('pk')}).order_by().values(
+        field).annotate(total=Count('pk')).values('total')
+
+    return Coalesce(Subquery(counts), Value(0))
+
+
+def reconcile_counters(topic_model=Topic, article_model=Article, comment_model=Comment,
+                       like_model=Like, user_model=UserModel):
+    # one UPDATE per model recomputing every counter from the source rows
+    active_articles = article_model.objects.filter(is_active=True)
+    active_comments = comment_model.objects.filter(is_active=True)
+    active_likes = like_model.objects.filter(like_dislike=True, is_active=True)
+
+    topic_model.objects.update(
+        articles_count=count_of(active_articles, 'topic'))
+
+    article_model.objects.update(
+        comments_count=count_of(active_comments, 'article'),
+        likes_count=count_of(active_likes, 'article'))
+
+    comment_model.objects.update(
+        likes_count=count_of(active_likes, 'comment'))
+
+    user_model.objects.update(
+        topics_count=count_of(topic_model.objects.filter(is_active=True), 'added_by'),
+        articles_count=count_of(active_articles, 'added_by'),
+        comments_count=count_of(active_comments, 'added_by'),
+        likes_count=count_of(active_likes, 'added_by'))
@@ -0,0 +1,53 @@
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+
+from .models import Article
+from .signals import featured_article_changed
+
+
+FEATURED_ARTICLE_KEY = 'posts:featured_article'
+FEATURED_ARTICLE_TIMEOUT = 60 * 60 * 24
+
+
+def load_featured_article():
+    return Article.objects.filter(is_featured=True, is_active=True).as_rows().first()
+
+
+def featured_article():
+    # the featured article as an ArticleRow, or None when there is none; the
+    # pointer is kept in the cache so the home page needs no query for it
+    entry = cache.get(FEATURED_ARTICLE_KEY)
+
+    if entry is None:
+        entry = (load_featured_article(),)
+        cache.set(FEATURED_ARTICLE_KEY, entry, FEATURED_ARTICLE_TIMEOUT)
+
+    return entry[0]
+
+
+def featured_ids(exclude_pk):
+    return list(Article.objects.select_for_update().filter(
+        is_featured=True).exclude(pk=exclude_pk).values_list('pk', flat=True))
+
+
+def set_featured_article(article):
+    # the previous article is unfeatured and the new one featured in a single
+    # transaction, with the previous row locked so that concurrent switches
+    # queue up; readers keep the old pointer until the new one is cached
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                previous_ids = featured_ids(article.pk)
+
+                Article.objects.filter(pk__in=previous_ids).update(is_featured=False)
+                Article.objects.filter(pk=article.pk).update(is_featured=True)
+            break
+        except IntegrityError:
+            # with nothing featured there was no row to lock, and a concurrent
+            # switch featured another article first; it is committed now, so
+            # a second pass locks and replaces it
+            if attempt:
+                raise
+
+    cache.set(FEATURED_ARTICLE_KEY, (load_featured_article(),), FEATURED_ARTICLE_TIMEOUT)
+    featured_article_changed.send(sender=Article, pk=article.pk, previous_pks=previous_ids)
@@ -0,0 +1,66 @@
+import hashlib
+import html
+import re
+
+from django.db import transaction
+
+
+HASH_BATCH_SIZE = 500
+
+TAG_NAME = re.compile(r'<\s*(/?)\s*([a-zA-Z][a-zA-Z0-9]*)')
+EMPTY_PARAGRAPH = re.compile(r'<p>\s*</p>')
+SPACE_AROUND_TAGS = re.compile(r'\s*(<[^>]*>)\s*')
+WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_body(body):
+    # entity spelling, tag case, blank paragraphs and runs of whitespace are
+    # all editor noise, so bodies differing only in those hash alike
+    body = html.unescape(body or '')
+    body = TAG_NAME.sub(lambda match: '<' + match.group(1) + match.group(2).lower(), body)
+    body = WHITESPACE.sub(' ', body)
+    body = EMPTY_PARAGRAPH.sub('', body)
+    body = SPACE_AROUND_TAGS.sub(r'\1', body)
+
+    return body.strip()
+
+
+def body_hash(body):
+    return hashlib.sha256(normalize_body(body).encode()).hexdigest()
+
+
+def hash_article_bodies(article_model, rehash=False, batch_size=HASH_BATCH_SIZE):
+    # fills in body_hash in primary key order, one transaction per batch, and
+    # returns the ids of articles left unhashed because an earlier article
+    # already has the same body
+    if rehash:
+        article_model.objects.update(body_hash=None)
+
+    duplicate_ids = []
+    last_pk = 0
+
+    while True:
+        articles = list(article_model.objects.filter(
+            pk__gt=last_pk, body_hash__isnull=True).order_by('pk').only('pk', 'body')[:batch_size])
+
+        if not articles:
+            return duplicate_ids
+
+        last_pk = articles[-1].pk
+
+        for article in articles:
+            article.body_hash = body_hash(article.body)
+
+        taken = set(article_model.objects.filter(
+            body_hash__in=[article.body_hash for article in articles]).values_list('body_hash', flat=True))
+
+        hashed = []
+        for article in articles:
+            if article.body_hash in taken:
+                duplicate_ids.append(article.pk)
+            else:
+                taken.add(article.body_hash)
+                hashed.append(article)
+
+        with transaction.atomic():
+            article_model.objects.bulk_update(hashed, ['body_hash'])
@@ -0,0 +1,292 @@
+from collections import Counter, defaultdict
+from datetime import datetime
+import atexit
+import fcntl
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.text import slugify
+
+from accounts.models import UserModel
+from .models import Topic, Article, Comment, Like
+from .signals import counters_changed
+
+
+TARGET_MODELS = {'topic': Topic, 'article': Article, 'comment': Comment}
+
+FLUSH_BATCH_SIZE = 500
+# claimed journals left behind for this long belong to a flush that died
+STALE_CLAIM_AFTER = 60
+
+
+def journal_paths(journal_dir):
+    # unclaimed journals first, then claims abandoned by a crashed flush;
+    # each group oldest first so later states win
+    journals = sorted(glob.glob(os.path.join(journal_dir, '*.journal')), key=os.path.getmtime)
+    claims = sorted(glob.glob(os.path.join(journal_dir, '*.flushing')), key=os.path.getmtime)
+
+    return journals + [path for path in claims
+                       if time.time() - os.path.getmtime(path) > STALE_CLAIM_AFTER]
+
+
+def claim(path):
+    # rename the journal under its lock so that no writer can append to it
+    # while it is read; returns its records, or None if someone else got it
+    claimed_path = path.rsplit('.', 1)[0] + '.' + uuid.uuid4().hex + '.flushing'
+
+    try:
+        journal = open(path, 'r')
+    except FileNotFoundError:
+        return None, None
+
+    with journal:
+        fcntl.flock(journal, fcntl.LOCK_EX)
+        if not os.path.exists(path) or os.stat(path).st_ino != os.fstat(journal.fileno()).st_ino:
+            return None, None
+
+        os.rename(path, claimed_path)
+        records = [json.loads(line) for line in journal if line.strip()]
+
+    return claimed_path, records
+
+
+def apply_records(records):
+    """
+    Write journaled like states to Like and the counter columns.
+
+    Records hold the state a toggle left behind, not the toggle itself, so
+    applying a journal twice (after a crash between commit and cleanup) is
+    harmless. Counter deltas are taken from the locked rows.
+    """
+
+    states = {}
+    for record in records:
+        states[(record['target'], record['id'], record['user'])] = record['liked']
+
+    now = timezone.now()
+    target_deltas = defaultdict(Counter)
+    author_deltas = Counter()
+
+    with transaction.atomic():
+        for target, model in TARGET_MODELS.items():
+            keys = {(pk, user): liked for (name, pk, user), liked in states.items() if name == target}
+            if not keys:
+                continue
+
+            existing = {
+                (getattr(like, target + '_id'), like.added_by_id): like
+                for like in Like.objects.select_for_update().filter(**{
+                    target + '_id__in': {pk for pk, user in keys},
+                    'added_by_id__in': {user for pk, user in keys}})}
+            slugs = dict(model.objects.filter(
+                pk__in={pk for pk, user in keys}).values_list('pk', 'slug'))
+
+            created, updated = [], []
+
+            for (pk, user), liked in keys.items():
+                like = existing.get((pk, user))
+                counted = bool(like and like.is_active and like.like_dislike)
+
+                if like is None:
+                    if liked and pk in slugs:
+                        created.append(Like(
+                            slug=slugify('{}-{}-{}'.format(slugs[pk], user, datetime.now()),
+                                         allow_unicode=False),
+                            added_by_id=user, **{target + '_id': pk}))
+                    else:
+                        continue
+                elif counted != liked:
+                    like.like_dislike = liked
+                    like.is_active = True
+                    like.deleted_at = None
+                    like.updated_at = now
+                    updated.append(like)
+                else:
+                    continue
+
+                delta = 1 if liked else -1
+                target_deltas[model][pk] += delta
+                author_deltas[user] += delta
+
+            Like.objects.bulk_create(created, batch_size=FLUSH_BATCH_SIZE)
+            Like.objects.bulk_update(
+                updated, ['like_dislike', 'is_active', 'deleted_at', 'updated_at'],
+                batch_size=FLUSH_BATCH_SIZE)
+
+        # topics have no like counter
+        target_deltas.pop(Topic, None)
+        target_deltas[UserModel] = author_deltas
+
+        for model, deltas in target_deltas.items():
+            model.objects.bulk_update(
+                [model(pk=pk, likes_count=F('likes_count') + delta)
+                 for pk, delta in deltas.items() if delta],
+                ['likes_count'], batch_size=FLUSH_BATCH_SIZE)
+
+    for model, deltas in target_deltas.items():
+        for pk, delta in deltas.items():
+            if delta:
+                counters_changed.send(sender=model, pk=pk)
+
+
+def flush_journals(journal_dir):
+    # apply every journal in the directory; used to recover after a crash
+    flushed = 0
+
+    for path in journal_paths(journal_dir):
+        claimed_path, records = claim(path) if path.endswith('.journal') else (path, None)
+        if claimed_path is None:
+            continue
+
+        if records is None:
+            with open(claimed_path) as journal:
+                records = [json.loads(line) for line in journal if line.strip()]
+
+        apply_records(records)
+        os.remove(claimed_path)
+        flushed += len(records)
+
+    return flushed
+
+
+class LikeBuffer:
+    """
+    Write-behind storage for like toggles, enabled by LIKES_WRITE_BEHIND.
+
+    A toggle is appended and fsynced to this process's journal before it is
+    acknowledged, and kept in memory so that the state and count returned
+    to the reader include it. A timer then writes the journal to the
+    database in batches. Journals that outlive their process are applied by
+    the flush_like_journal command. Pending toggles are only visible to this
+    process, which is why settings allow the mode with a single worker only.
+    """
+
+    def __init__(self, journal_dir, flush_interval=None):
+        os.makedirs(journal_dir, exist_ok=True)
+
+        self.journal_dir = journal_dir
+        self.journal_path = os.path.join(journal_dir, 'likes-{}.journal'.format(os.getpid()))
+        self.flush_interval = flush_interval
+        self.lock = threading.RLock()
+        self.timer = None
+        # claimed journals that could not be applied yet
+        self.failed_claims = []
+        # (target, pk, user) -> (state in the database, state after the
+        # buffered toggles)
+        self.pending = {}
+
+    def append(self, record):
+        line = json.dumps(record) + '\n'
+
+        while True:
+            with open(self.journal_path, 'a') as journal:
+                fcntl.flock(journal, fcntl.LOCK_EX)
+
+                # the journal may have been claimed while we waited for it
+                if os.path.exists(self.journal_path) and \
+                        os.stat(self.journal_path).st_ino == os.fstat(journal.fileno()).st_ino:
+                    journal.write(line)
+                    journal.flush()
+                    os.fsync(journal.fileno())
+                    return
+
+    def toggle(self, user, target_name, target):
+        key = (target_name, target.pk, user.pk)
+
+        with self.lock:
+            if key in self.pending:
+                stored, liked = self.pending[key]
+            else:
+                stored = liked = Like.objects.filter(
+                    like_dislike=True, is_active=True, added_by=user,
+                    **{target_name: target}).exists()
+
+            liked = not liked
+            self.append({'target': target_name, 'id': target.pk, 'user': user.pk, 'liked': liked})
+            self.pending[key] = (stored, liked)
+            self.schedule_flush()
+
+            pending_delta = sum(int(now) - int(before) for (name, pk, _), (before, now)
+                                in self.pending.items() if (name, pk) == key[:2])
+
+        return liked, pending_delta
+
+    def schedule_flush(self):
+        if self.flush_interval is None or self.timer is not None:
+            return
+
+        self.timer = threading.Timer(self.flush_interval, self.flush_in_background)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def flush_in_background(self):
+        try:
+            self.flush()
+        finally:
+            connections.close_all()
+
+    def flush(self):
+        with self.lock:
+            self.timer = None
+            snapshot = dict(self.pending)
+            claimed_path, claimed_records = claim(self.journal_path)
+            # claims whose apply failed are retried before the new one
+            claims = self.failed_claims + ([claimed_path] if claimed_path is not None else [])
+            self.failed_claims = []
+
+        flushed = 0
+
+        for index, path in enumerate(claims):
+            if path == claimed_path:
+                records = claimed_records
+            else:
+                # flush_like_journal may have recovered it in the meantime
+                try:
+                    with open(path) as journal:
+                        records = [json.loads(line) for line in journal if line.strip()]
+                except FileNotFoundError:
+                    continue
+
+            try:
+                apply_records(records)
+            except Exception:
+                # keep the claims and the pending states until a flush succeeds
+                with self.lock:
+                    self.failed_claims = claims[index:] + self.failed_claims
+                    self.schedule_flush()
+                raise
+
+            os.remove(path)
+            flushed += len(records)
+
+        with self.lock:
+            for key, (stored, liked) in snapshot.items():
+                if self.pending.get(key) == (stored, liked):
+                    del self.pending[key]
+                elif key in self.pending:
+                    self.pending[key] = (liked, self.pending[key][1])
+
+        return flushed
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_like_buffer():
+    global _buffer
+
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = LikeBuffer(settings.LIKES_JOURNAL_DIR, settings.LIKES_FLUSH_INTERVAL)
+            atexit.register(_buffer.flush)
+
+    return _buffer
@@ -0,0 +1,113 @@
+from collections import namedtuple
+from datetime import datetime
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from accounts.models import UserModel
+from .counters import increment_counters
+from .like_buffer import get_like_buffer
+from .models import Topic, Article, Comment, Like
+
+
+# the Like column pointing at each kind of target
+LIKE_TARGETS = {Topic: 'topic', Article: 'article', Comment: 'comment'}
+
+LikeToggle = namedtuple('LikeToggle', ['liked', 'likes_count'])
+
+
+def upsert_like(user, target, now):
+    # INSERT ... ON CONFLICT against the (added_by, target) unique constraint,
+    # flipping the existing row in the same statement; returns whether the
+    # row now counts as a like
+    target_column = LIKE_TARGETS[type(target)] + '_id'
+    slug = slugify('{}-{}-{}'.format(target.slug, user.pk, datetime.now()), allow_unicode=False)
+    now = Like._meta.get_field('updated_at').get_db_prep_value(now, connection)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'INSERT INTO posts_like (like_dislike, slug, {target}, added_by_id, is_active, '
+            'created_at, updated_at) VALUES (%s, %s, %s, %s, %s, %s, %s) '
+            'ON CONFLICT (added_by_id, {target}) WHERE {target} IS NOT NULL DO UPDATE SET '
+            'like_dislike = CASE WHEN posts_like.is_active THEN NOT posts_like.like_dislike ELSE %s END, '
+            'is_active = %s, deleted_at = NULL, updated_at = excluded.updated_at '
+            'RETURNING like_dislike'.format(target=target_column),
+            [True, slug, target.pk, user.pk, True, now, now, True, True])
+
+        return bool(cursor.fetchone()[0])
+
+
+def toggle_like_row(user, target):
+    # databases without ON CONFLICT lock the row instead
+    like, created = Like.objects.select_for_update().get_or_create(
+        added_by=user, **{LIKE_TARGETS[type(target)]: target},
+        defaults={'slug': slugify('{}-{}-{}'.format(
+            target.slug, user.pk, datetime.now()), allow_unicode=False)})
+
+    if not created:
+        like.like_dislike = not like.like_dislike or not like.is_active
+        like.is_active = True
+        like.deleted_at = None
+        like.save(update_fields=['like_dislike', 'is_active', 'deleted_at', 'updated_at'])
+
+    return like.like_dislike
+
+
+def likes_count_of(target):
+    if type(target) is Topic:
+        return Like.objects.filter(topic=target, like_dislike=True, is_active=True).count()
+
+    return type(target).objects.filter(pk=target.pk).values_list('likes_count', flat=True).get()
+
+
+def liked_ids(user, target_name, ids):
+    # which of `ids` (of the 'topic', 'article' or 'comment' kind) `user`
+    # currently likes, in one IN query, with toggles still waiting in the
+    # write-behind buffer applied on top
+    ids = set(ids)
+    if not user.is_authenticated or not ids:
+        return set()
+
+    liked = set(Like.objects.filter(
+        like_dislike=True, is_active=True, added_by=user,
+        **{target_name + '_id__in': ids}).values_list(target_name + '_id', flat=True))
+
+    if settings.LIKES_WRITE_BEHIND:
+        for (name, pk, user_pk), (stored, now) in list(get_like_buffer().pending.items()):
+            if name == target_name and user_pk == user.pk and pk in ids:
+                (liked.add if now else liked.discard)(pk)
+
+    return liked
+
+
+def toggle_like(user, target):
+    """
+    Like `target` (a Topic, Article or Comment) for `user`, or take the like
+    back if there is one, and return the new state with the target's count.
+
+    Each user has at most one Like row per target, enforced by unique
+    constraints, so concurrent clicks flip that row in turn instead of
+    creating duplicates. With LIKES_WRITE_BEHIND the toggle is journaled and
+    written later instead (see posts/like_buffer.py).
+    """
+
+    if settings.LIKES_WRITE_BEHIND:
+        liked, pending_delta = get_like_buffer().toggle(user, LIKE_TARGETS[type(target)], target)
+        likes_count = likes_count_of(target) + pending_delta
+    else:
+        with transaction.atomic():
+            if connection.vendor in ('sqlite', 'postgresql'):
+                liked = upsert_like(user, target, timezone.now())
+            else:
+                liked = toggle_like_row(user, target)
+
+            delta = 1 if liked else -1
+            if type(target) is not Topic:
+                increment_counters(type(target), target.pk, likes_count=delta)
+            increment_counters(UserModel, user.pk, likes_count=delta)
+
+        likes_count = likes_count_of(target)
+
+    return LikeToggle(liked, likes_count)
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.like_buffer import flush_journals
+
+
+class Command(BaseCommand):
+    help = 'Write journaled like toggles left behind by stopped processes to the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--journal-dir', default=settings.LIKES_JOURNAL_DIR,
+            help='Directory holding the like journals')
+
+    def handle(self, *args, **options):
+        flushed = flush_journals(options['journal_dir'])
+
+        self.stdout.write(self.style.SUCCESS(str(flushed) + ' journaled likes written'))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from posts.hashing import HASH_BATCH_SIZE, hash_article_bodies
+from posts.models import Article
+
+
+class Command(BaseCommand):
+    help = 'Fill in the content hash of articles that do not have one yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=HASH_BATCH_SIZE,
+            help='Articles hashed per transaction')
+        parser.add_argument(
+            '--rehash', action='store_true',
+            help='Recompute every hash, e.g. after the normalization changed')
+
+    def handle(self, *args, **options):
+        duplicate_ids = hash_article_bodies(
+            Article, rehash=options['rehash'], batch_size=options['batch_size'])
+
+        if duplicate_ids:
+            self.stdout.write(self.style.WARNING(
+                'Articles duplicating an earlier body were left unhashed: ' +
+                ', '.join(str(pk) for pk in duplicate_ids)))
+
+        self.stdout.write(self.style.SUCCESS('Article bodies hashed'))
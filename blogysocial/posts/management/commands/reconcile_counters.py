@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from posts.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute the engagement counters on topics, articles, comments and authors'
+
+    def handle(self, *args, **options):
+        reconcile_counters()
+
+        self.stdout.write(self.style.SUCCESS('Engagement counters reconciled'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import Article
+from posts.summaries import SUMMARY_BATCH_SIZE, summarize_articles
+
+
+class Command(BaseCommand):
+    help = 'Recompute the excerpt, word count and reading time of every article'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=SUMMARY_BATCH_SIZE,
+            help='Articles updated per transaction')
+
+    def handle(self, *args, **options):
+        summarized = summarize_articles(Article, batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(str(summarized) + ' articles summarized'))
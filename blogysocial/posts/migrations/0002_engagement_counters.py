@@ -0,0 +1,73 @@
+# Generated by Django 4.2 on 2026-10-18 18:51
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_of(queryset, field):
+    counts = queryset.filter(**{field: OuterRef('pk')}).order_by().values(
+        field).annotate(total=Count('pk')).values('total')
+
+    return Coalesce(Subquery(counts), Value(0))
+
+
+def backfill_counters(apps, schema_editor):
+    # a frozen copy of posts.counters.reconcile_counters
+    Topic = apps.get_model('posts', 'Topic')
+    Article = apps.get_model('posts', 'Article')
+    Comment = apps.get_model('posts', 'Comment')
+    Like = apps.get_model('posts', 'Like')
+    UserModel = apps.get_model('accounts', 'UserModel')
+
+    active_articles = Article.objects.filter(is_active=True)
+    active_comments = Comment.objects.filter(is_active=True)
+    active_likes = Like.objects.filter(like_dislike=True, is_active=True)
+
+    Topic.objects.update(
+        articles_count=count_of(active_articles, 'topic'))
+
+    Article.objects.update(
+        comments_count=count_of(active_comments, 'article'),
+        likes_count=count_of(active_likes, 'article'))
+
+    Comment.objects.update(
+        likes_count=count_of(active_likes, 'comment'))
+
+    UserModel.objects.update(
+        topics_count=count_of(Topic.objects.filter(is_active=True), 'added_by'),
+        articles_count=count_of(active_articles, 'added_by'),
+        comments_count=count_of(active_comments, 'added_by'),
+        likes_count=count_of(active_likes, 'added_by'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_usermodel_counters'),
+        ('posts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Number of active comments'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Number of likes'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Number of likes'),
+        ),
+        migrations.AddField(
+            model_name='topic',
+            name='articles_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Number of active articles'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2 on 2026-10-18 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0002_engagement_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='posts_art_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-updated_at', '-id'], name='posts_art_active_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['topic', '-updated_at', '-id'], name='posts_art_topic_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['added_by', '-updated_at', '-id'], name='posts_art_author_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-updated_at', '-id'], name='posts_com_active_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['article', '-updated_at', '-id'], name='posts_com_article_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['added_by', '-updated_at', '-id'], name='posts_com_author_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='like',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-updated_at', '-id'], name='posts_like_active_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='like',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['added_by', '-updated_at', '-id'], name='posts_like_author_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='topic',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='posts_topic_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='topic',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-updated_at', '-id'], name='posts_topic_active_updated_idx'),
+        ),
+    ]
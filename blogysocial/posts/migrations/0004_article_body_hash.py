@@ -0,0 +1,63 @@
+# Generated by Django 4.2 on 2026-10-18 19:02
+
+import ckeditor.fields
+import hashlib
+import html
+import re
+
+from django.db import migrations, models
+
+
+TAG_NAME = re.compile(r'<\s*(/?)\s*([a-zA-Z][a-zA-Z0-9]*)')
+EMPTY_PARAGRAPH = re.compile(r'<p>\s*</p>')
+SPACE_AROUND_TAGS = re.compile(r'\s*(<[^>]*>)\s*')
+WHITESPACE = re.compile(r'\s+')
+
+
+def body_hash(body):
+    # a frozen copy of posts.hashing.body_hash
+    body = html.unescape(body or '')
+    body = TAG_NAME.sub(lambda match: '<' + match.group(1) + match.group(2).lower(), body)
+    body = WHITESPACE.sub(' ', body)
+    body = EMPTY_PARAGRAPH.sub('', body)
+    body = SPACE_AROUND_TAGS.sub(r'\1', body)
+
+    return hashlib.sha256(body.strip().encode()).hexdigest()
+
+
+def backfill_body_hashes(apps, schema_editor):
+    # bodies duplicating an earlier article are left unhashed, as the
+    # hash_article_bodies command does
+    Article = apps.get_model('posts', 'Article')
+
+    taken = set()
+    hashed = []
+
+    for article in Article.objects.order_by('pk').only('pk', 'body').iterator():
+        article.body_hash = body_hash(article.body)
+        if article.body_hash not in taken:
+            taken.add(article.body_hash)
+            hashed.append(article)
+
+    Article.objects.bulk_update(hashed, ['body_hash'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_active_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='body_hash',
+            field=models.CharField(editable=False, max_length=64, null=True, unique=True, verbose_name='Body hash'),
+        ),
+        migrations.AlterField(
+            model_name='article',
+            name='body',
+            field=ckeditor.fields.RichTextField(verbose_name='Write your Article'),
+        ),
+        migrations.RunPython(backfill_body_hashes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 4.2 on 2026-10-18 19:03
+
+import html
+import math
+import re
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+
+EXCERPT_WORDS = 60
+EXCERPT_MAX_LENGTH = 500
+WORDS_PER_MINUTE = 200
+
+BLOCK_END = re.compile(r'(</(?:p|div|li|h[1-6]|blockquote|pre|td|th)>|<br\s*/?>)', re.IGNORECASE)
+
+
+def summarize(body):
+    # a frozen copy of posts.summaries.summarize
+    text = ' '.join(html.unescape(strip_tags(BLOCK_END.sub(r'\1 ', body or ''))).split())
+    word_count = len(text.split())
+
+    excerpt = Truncator(text).words(EXCERPT_WORDS)[:EXCERPT_MAX_LENGTH]
+    reading_time = math.ceil(word_count / WORDS_PER_MINUTE)
+
+    return excerpt, word_count, reading_time
+
+
+def backfill_summaries(apps, schema_editor):
+    Article = apps.get_model('posts', 'Article')
+
+    articles = []
+    for article in Article.objects.order_by('pk').only('pk', 'body').iterator(chunk_size=500):
+        article.excerpt, article.word_count, article.reading_time = summarize(article.body)
+        articles.append(article)
+
+        if len(articles) == 500:
+            Article.objects.bulk_update(articles, ['excerpt', 'word_count', 'reading_time'])
+            articles = []
+
+    Article.objects.bulk_update(articles, ['excerpt', 'word_count', 'reading_time'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_article_body_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=500, verbose_name='Excerpt'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Reading time in minutes'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Number of words'),
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2 on 2026-10-18 19:15
+
+from django.db import migrations, models
+
+
+def keep_latest_featured_article(apps, schema_editor):
+    Article = apps.get_model('posts', 'Article')
+
+    latest = Article.objects.filter(is_featured=True).order_by('-updated_at', '-id').first()
+    if latest is not None:
+        Article.objects.filter(is_featured=True).exclude(pk=latest.pk).update(is_featured=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_article_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_latest_featured_article, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='article',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_featured', True)), fields=('is_featured',), name='posts_one_featured_article'),
+        ),
+    ]
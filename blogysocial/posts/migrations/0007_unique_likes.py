@@ -0,0 +1,63 @@
+# Generated by Django 4.2 on 2026-10-18 19:17
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_of(queryset, field):
+    counts = queryset.filter(**{field: OuterRef('pk')}).order_by().values(
+        field).annotate(total=Count('pk')).values('total')
+
+    return Coalesce(Subquery(counts), Value(0))
+
+
+def remove_duplicate_likes(apps, schema_editor):
+    # keep the most recently updated like per user and target, then recount
+    Like = apps.get_model('posts', 'Like')
+
+    for target in ('topic', 'article', 'comment'):
+        seen = set()
+        duplicates = []
+
+        for like_id, user_id, target_id in Like.objects.filter(**{target + '__isnull': False}).order_by(
+                '-updated_at', '-id').values_list('id', 'added_by_id', target + '_id').iterator():
+            if (user_id, target_id) in seen:
+                duplicates.append(like_id)
+            seen.add((user_id, target_id))
+
+        for start in range(0, len(duplicates), 500):
+            Like.objects.filter(id__in=duplicates[start:start + 500]).delete()
+
+    active_likes = Like.objects.filter(like_dislike=True, is_active=True)
+
+    apps.get_model('posts', 'Article').objects.update(
+        likes_count=count_of(active_likes, 'article'))
+    apps.get_model('posts', 'Comment').objects.update(
+        likes_count=count_of(active_likes, 'comment'))
+    apps.get_model('accounts', 'UserModel').objects.update(
+        likes_count=count_of(active_likes, 'added_by'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_active_indexes'),
+        ('posts', '0006_one_featured_article'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_likes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='like',
+            constraint=models.UniqueConstraint(condition=models.Q(('topic__isnull', False)), fields=('added_by', 'topic'), name='posts_like_unique_topic'),
+        ),
+        migrations.AddConstraint(
+            model_name='like',
+            constraint=models.UniqueConstraint(condition=models.Q(('article__isnull', False)), fields=('added_by', 'article'), name='posts_like_unique_article'),
+        ),
+        migrations.AddConstraint(
+            model_name='like',
+            constraint=models.UniqueConstraint(condition=models.Q(('comment__isnull', False)), fields=('added_by', 'comment'), name='posts_like_unique_comment'),
+        ),
+    ]
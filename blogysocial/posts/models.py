@@ -1,9 +1,19 @@
 from ckeditor.fields import RichTextField
 
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Q
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from accounts.models import UserModel
+from .hashing import body_hash
+from .projections import ArticleQuerySet
+from .summaries import summarize
+
+
+# rows hidden by a soft delete are never listed, so the list indexes below
+# only cover active rows
+ACTIVE = Q(is_active=True)
 
 
 class Topic(models.Model):
@@ -34,6 +44,11 @@ class Topic(models.Model):
         help_text=_('Change topic visibility'),
         default=True,
     )
+    articles_count = models.PositiveIntegerField(
+        verbose_name=_('Number of active articles'),
+        default=0,
+        editable=False,
+    )
     created_at = models.DateTimeField(
         _('Created at'), auto_now_add=True, editable=False)
     updated_at = models.DateTimeField(_('Updated at'), auto_now=True)
@@ -42,6 +57,12 @@ class Topic(models.Model):
     class Meta:
         verbose_name = _('Topic')
         verbose_name_plural = _('Topics')
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='posts_topic_active_created_idx',
+                         condition=ACTIVE),
+            models.Index(fields=['-updated_at', '-id'], name='posts_topic_active_updated_idx',
+                         condition=ACTIVE),
+        ]
 
     def get_absolute_url(self):
         return reverse('posts:view_topic', args=[self.slug])
@@ -69,7 +90,33 @@ class Article(models.Model):
         unique=True)
     body = RichTextField(
         verbose_name=_('Write your Article'),
+    )
+    # bodies are deduplicated through this fixed-size hash rather than a
+    # unique index over the HTML itself (see posts/hashing.py)
+    body_hash = models.CharField(
+        verbose_name=_('Body hash'),
+        max_length=64,
         unique=True,
+        null=True,
+        editable=False,
+    )
+    # plain-text summary derived from the body on save, so list pages never
+    # need to load or parse the body itself
+    excerpt = models.CharField(
+        verbose_name=_('Excerpt'),
+        max_length=500,
+        blank=True,
+        editable=False,
+    )
+    word_count = models.PositiveIntegerField(
+        verbose_name=_('Number of words'),
+        default=0,
+        editable=False,
+    )
+    reading_time = models.PositiveSmallIntegerField(
+        verbose_name=_('Reading time in minutes'),
+        default=0,
+        editable=False,
     )
     image = models.ImageField(
         verbose_name=_('Article Preview Image'),
@@ -88,14 +135,74 @@ class Article(models.Model):
         help_text=_('Change topic visibility'),
         default=True,
     )
+    comments_count = models.PositiveIntegerField(
+        verbose_name=_('Number of active comments'),
+        default=0,
+        editable=False,
+    )
+    likes_count = models.PositiveIntegerField(
+        verbose_name=_('Number of likes'),
+        default=0,
+        editable=False,
+    )
     created_at = models.DateTimeField(
         _('Created at'), auto_now_add=True, editable=False)
     updated_at = models.DateTimeField(_('Updated at'), auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
 
+    objects = ArticleQuerySet.as_manager()
+
     class Meta:
         verbose_name = _('Article')
         verbose_name_plural = _('Articles')
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='posts_art_active_created_idx',
+                         condition=ACTIVE),
+            models.Index(fields=['-updated_at', '-id'], name='posts_art_active_updated_idx',
+                         condition=ACTIVE),
+            models.Index(fields=['topic', '-updated_at', '-id'], name='posts_art_topic_updated_idx',
+                         condition=ACTIVE),
+            models.Index(fields=['added_by', '-updated_at', '-id'], name='posts_art_author_updated_idx',
+                         condition=ACTIVE),
+        ]
+        constraints = [
+            # at most one featured article (see posts/featured.py)
+            models.UniqueConstraint(fields=['is_featured'], condition=Q(is_featured=True),
+                                    name='posts_one_featured_article'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        article = super().from_db(db, field_names, values)
+        # the stored body, so that saves which leave it alone keep its hash:
+        # bodies duplicated before hashing was added stay unhashed
+        article._stored_body = article.__dict__.get('body')
+        return article
+
+    def body_changed(self):
+        # a deferred body was not loaded, so it cannot have been edited
+        return 'body' in self.__dict__ and (
+            self._state.adding or self.body != getattr(self, '_stored_body', None))
+
+    def validate_unique(self, exclude=None):
+        super().validate_unique(exclude)
+
+        if (exclude is None or 'body' not in exclude) and self.body_changed() and \
+                Article.objects.filter(body_hash=body_hash(self.body)).exclude(pk=self.pk).exists():
+            raise ValidationError({'body': _('An article with this body already exists.')})
+
+    def save(self, *args, **kwargs):
+        if self.body_changed():
+            self.body_hash = body_hash(self.body)
+            self.excerpt, self.word_count, self.reading_time = summarize(self.body)
+
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'body' in update_fields:
+                kwargs['update_fields'] = set(update_fields) | {
+                    'body_hash', 'excerpt', 'word_count', 'reading_time'}
+
+        super().save(*args, **kwargs)
+        self._stored_body = self.__dict__.get('body')
 
     def get_absolute_url(self):
         return reverse('posts:view_article', args=[self.slug])
@@ -134,11 +241,26 @@ class Comment(models.Model):
         help_text=_('Change comment visibility'),
         default=True,
     )
+    likes_count = models.PositiveIntegerField(
+        verbose_name=_('Number of likes'),
+        default=0,
+        editable=False,
+    )
     created_at = models.DateTimeField(
         _('Created at'), auto_now_add=True, editable=False)
     updated_at = models.DateTimeField(_('Updated at'), auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-updated_at', '-id'], name='posts_com_active_updated_idx',
+                         condition=ACTIVE),
+            models.Index(fields=['article', '-updated_at', '-id'], name='posts_com_article_updated_idx',
+                         condition=ACTIVE),
+            models.Index(fields=['added_by', '-updated_at', '-id'], name='posts_com_author_updated_idx',
+                         condition=ACTIVE),
+        ]
+
 
 class Like(models.Model):
     like_dislike = models.BooleanField(
@@ -181,6 +303,22 @@ class Like(models.Model):
     updated_at = models.DateTimeField(_('Updated at'), auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-updated_at', '-id'], name='posts_like_active_updated_idx',
+                         condition=ACTIVE),
+            models.Index(fields=['added_by', '-updated_at', '-id'], name='posts_like_author_updated_idx',
+                         condition=ACTIVE),
+        ]
+        constraints = [
+            # one row per user and target, flipped by posts/likes.py
+            models.UniqueConstraint(fields=['added_by', 'topic'], condition=Q(topic__isnull=False),
+                                    name='posts_like_unique_topic'),
+            models.UniqueConstraint(fields=['added_by', 'article'], condition=Q(article__isnull=False),
+                                    name='posts_like_unique_article'),
+            models.UniqueConstraint(fields=['added_by', 'comment'], condition=Q(comment__isnull=False),
+                                    name='posts_like_unique_comment'),
+        ]
 
 # class Reaction(models.Model):
 #     REACTION_CHOICES = [
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import threading
+import time
+
+from django.core import signing
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db import connections, models
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+
+CURSOR_SALT = 'posts.pagination.cursor'
+
+# filtered sets up to this size are always counted exactly
+EXACT_COUNT_THRESHOLD = 1000
+COUNT_CACHE_TIMEOUT = 60 * 30
+COUNT_REFRESH_AFTER = 60
+
+
+class KeysetPage(Page):
+    def __init__(self, object_list, number, paginator, has_next=None, has_previous=None):
+        super().__init__(object_list, number, paginator)
+        self.keyset_has_next = has_next
+        self.keyset_has_previous = has_previous
+
+    def has_next(self):
+        if self.keyset_has_next is not None:
+            return self.keyset_has_next
+        return super().has_next()
+
+    def has_previous(self):
+        if self.keyset_has_previous is not None:
+            return self.keyset_has_previous
+        return super().has_previous()
+
+    @cached_property
+    def next_cursor(self):
+        if not self.has_next() or not len(self):
+            return None
+        return self.paginator.encode_cursor('next', self[-1], self.number + 1)
+
+    @cached_property
+    def previous_cursor(self):
+        if not self.has_previous() or not len(self):
+            return None
+        return self.paginator.encode_cursor('previous', self[0], self.number - 1)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    A Paginator that avoids a full COUNT(*) on large tables.
+
+    Sets of up to EXACT_COUNT_THRESHOLD rows are counted exactly with a
+    bounded COUNT over a LIMIT subquery. Larger sets use the last exact count
+    from the cache, or the planner's row estimate when the database offers
+    one, while a background thread refreshes the exact count. Page bars on
+    large sets may therefore be a little off until the refresh lands.
+    """
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+
+        # never reads more than EXACT_COUNT_THRESHOLD + 1 rows
+        bounded_count = self.object_list[:EXACT_COUNT_THRESHOLD + 1].count()
+
+        if bounded_count <= EXACT_COUNT_THRESHOLD:
+            return bounded_count
+
+        key = self.count_cache_key()
+        cached = cache.get(key)
+
+        if cached is not None:
+            count, counted_at = cached
+            if time.time() - counted_at > COUNT_REFRESH_AFTER:
+                self.refresh_count_later(key)
+            return max(count, bounded_count)
+
+        self.refresh_count_later(key)
+        return max(self.estimated_count() or 0, bounded_count)
+
+    def count_cache_key(self):
+        query = str(self.object_list.order_by().query)
+        return 'posts:count:' + hashlib.md5(query.encode()).hexdigest()
+
+    def estimated_count(self):
+        connection = connections[self.object_list.db]
+
+        if connection.vendor != 'postgresql':
+            return None
+
+        sql, params = self.object_list.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            plan = cursor.fetchone()[0]
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def refresh_count_later(self, key):
+        # one refresh per query at a time, whichever worker gets there first
+        if not cache.add(key + ':refreshing', True, COUNT_REFRESH_AFTER):
+            return
+
+        queryset = self.object_list.order_by()
+
+        def refresh():
+            try:
+                cache.set(key, (queryset.count(), time.time()),
+                          COUNT_CACHE_TIMEOUT)
+            finally:
+                cache.delete(key + ':refreshing')
+                connections.close_all()
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+
+class KeysetPaginator(EstimatedCountPaginator):
+    """
+    A Paginator whose pages also carry opaque next/previous cursors.
+
+    Following a cursor seeks past the last row seen using the ordering
+    columns instead of an OFFSET, so deep pages cost the same as page 1 and
+    never need a COUNT. The ordering must end with a unique column such as
+    '-id' so that every row has a distinct position.
+    """
+
+    def __init__(self, object_list, per_page, ordering=('-created_at', '-id'), **kwargs):
+        super().__init__(object_list.order_by(*ordering), per_page, **kwargs)
+        self.ordering = ordering
+
+    def _get_page(self, *args, **kwargs):
+        return KeysetPage(*args, **kwargs)
+
+    def field_names(self):
+        return [field.lstrip('-') for field in self.ordering]
+
+    def encode_cursor(self, direction, row, number):
+        values = []
+        for name in self.field_names():
+            value = getattr(row, name)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+
+        return signing.dumps([direction, values, number], salt=CURSOR_SALT, compress=True)
+
+    def decode_cursor(self, cursor):
+        direction, values, number = signing.loads(cursor, salt=CURSOR_SALT)
+
+        model = self.object_list.model
+        for index, name in enumerate(self.field_names()):
+            if isinstance(model._meta.get_field(name), models.DateTimeField):
+                values[index] = parse_datetime(values[index])
+
+        return direction, values, number
+
+    def seek_condition(self, values, forward):
+        # rows strictly after `values` in the ordering (or before them when
+        # walking backwards): (a < x) OR (a = x AND b < y) OR ...
+        condition = Q()
+        equal = Q()
+
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            descending = field.startswith('-')
+            lookup = 'lt' if descending == forward else 'gt'
+
+            condition |= equal & Q(**{name + '__' + lookup: value})
+            equal &= Q(**{name: value})
+
+        return condition
+
+    def cursor_page(self, cursor):
+        try:
+            direction, values, number = self.decode_cursor(cursor)
+        except (signing.BadSignature, TypeError, ValueError):
+            return self.get_page(1)
+
+        forward = direction == 'next'
+        ordering = self.ordering if forward else [
+            field[1:] if field.startswith('-') else '-' + field for field in self.ordering]
+
+        rows = list(self.object_list.filter(self.seek_condition(
+            values, forward)).order_by(*ordering)[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if forward:
+            return KeysetPage(rows, number, self, has_next=has_more, has_previous=True)
+
+        rows.reverse()
+        return KeysetPage(rows, max(number, 1), self, has_next=True, has_previous=has_more)
+
+
+def paginate(request, queryset, page=1, per_page=10, ordering=('-created_at', '-id'), cursor_param='cursor'):
+    paginator = KeysetPaginator(queryset, per_page=per_page, ordering=ordering)
+
+    cursor = request.GET.get(cursor_param)
+    page_objects = paginator.cursor_page(cursor) if cursor else paginator.get_page(page)
+    page_objects.cursor_param = cursor_param
+    page_objects.adjusted_elided_pages = paginator.get_elided_page_range(
+        page_objects.number)
+
+    return page_objects
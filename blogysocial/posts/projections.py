@@ -0,0 +1,77 @@
+from django.db import models
+from django.db.models.query import ValuesIterable
+from django.urls import reverse
+
+
+class Row:
+    """
+    A compact, read-only stand-in for a model instance on list pages.
+
+    Rows hold only the columns a list template reads, in __slots__, and
+    compare equal to any object with the same pk (so that
+    `article.added_by == request.user` still works in templates).
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    @property
+    def pk(self):
+        return self.id
+
+    def __eq__(self, other):
+        return getattr(other, 'pk', None) == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return '<{} {}>'.format(type(self).__name__, self.id)
+
+
+class TopicRow(Row):
+    __slots__ = ('id', 'title', 'slug', 'representative_color')
+
+
+class AuthorRow(Row):
+    __slots__ = ('id', 'username', 'name')
+
+
+class ArticleRow(Row):
+    __slots__ = ('id', 'title', 'slug', 'excerpt', 'image', 'reading_time', 'comments_count',
+                 'likes_count', 'is_featured', 'created_at', 'updated_at', 'topic', 'added_by')
+
+    def get_absolute_url(self):
+        return reverse('posts:view_article', args=[self.slug])
+
+
+RELATED_ROWS = {'topic': TopicRow, 'added_by': AuthorRow}
+
+ARTICLE_ROW_FIELDS = [name for name in ArticleRow.__slots__ if name not in RELATED_ROWS] + [
+    related + '__' + name for related, row in RELATED_ROWS.items() for name in row.__slots__]
+
+
+class ArticleRowIterable(ValuesIterable):
+    def __iter__(self):
+        image_field = self.queryset.model._meta.get_field('image')
+
+        for values in super().__iter__():
+            for related, row in RELATED_ROWS.items():
+                values[related] = row(**{
+                    name: values.pop(related + '__' + name) for name in row.__slots__})
+
+            values['image'] = image_field.attr_class(None, image_field, values['image'])
+
+            yield ArticleRow(**values)
+
+
+class ArticleQuerySet(models.QuerySet):
+    def as_rows(self):
+        # one query selecting only the list columns, with topic and author
+        # joined in, yielding ArticleRow objects instead of model instances
+        queryset = self.values(*ARTICLE_ROW_FIELDS)
+        queryset._iterable_class = ArticleRowIterable
+        return queryset
@@ -0,0 +1,10 @@
+from django.dispatch import Signal
+
+
+# sent by increment_counters(), whose UPDATE queries bypass post_save;
+# receivers get the model class as sender and the row's pk
+counters_changed = Signal()
+
+# sent by set_featured_article() after its UPDATE queries, with the pk of the
+# new featured article and the pks of the articles it replaced
+featured_article_changed = Signal()
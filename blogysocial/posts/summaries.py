@@ -0,0 +1,56 @@
+import html
+import math
+import re
+
+from django.db import transaction
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+
+EXCERPT_WORDS = 60
+EXCERPT_MAX_LENGTH = 500
+WORDS_PER_MINUTE = 200
+SUMMARY_BATCH_SIZE = 500
+
+# closing block tags separate words even when the editor leaves no space
+BLOCK_END = re.compile(r'(</(?:p|div|li|h[1-6]|blockquote|pre|td|th)>|<br\s*/?>)', re.IGNORECASE)
+
+
+def plain_text(body):
+    return ' '.join(html.unescape(strip_tags(BLOCK_END.sub(r'\1 ', body or ''))).split())
+
+
+def summarize(body):
+    # (excerpt, word count, reading time in minutes) of a rich-text body
+    text = plain_text(body)
+    word_count = len(text.split())
+
+    excerpt = Truncator(text).words(EXCERPT_WORDS)[:EXCERPT_MAX_LENGTH]
+    reading_time = math.ceil(word_count / WORDS_PER_MINUTE)
+
+    return excerpt, word_count, reading_time
+
+
+def summarize_articles(article_model, batch_size=SUMMARY_BATCH_SIZE):
+    # recomputes the summary fields of every article in primary key order,
+    # one transaction per batch, and returns how many were updated
+    summarized = 0
+    last_pk = 0
+
+    while True:
+        articles = list(article_model.objects.filter(
+            pk__gt=last_pk).order_by('pk').only('pk', 'body')[:batch_size])
+
+        if not articles:
+            return summarized
+
+        last_pk = articles[-1].pk
+
+        for article in articles:
+            article.excerpt, article.word_count, article.reading_time = summarize(article.body)
+
+        with transaction.atomic():
+            article_model.objects.bulk_update(
+                articles, ['excerpt', 'word_count', 'reading_time'])
+
+        summarized += len(articles)
@@ -0,0 +1,110 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.text import slugify
+
+from accounts.models import UserModel
+from posts.featured import featured_article, featured_ids as real_featured_ids, set_featured_article
+from posts.models import Topic, Article
+
+
+class FeaturedArticleTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890',
+            is_active=True
+        )
+
+        cls.topic = Topic.objects.create(
+            title='First Topic',
+            slug=slugify('First Topic', allow_unicode=False),
+            description='This is the first topic.',
+            added_by=cls.user
+        )
+
+        cls.first_article = Article.objects.create(
+            title='First Article',
+            slug=slugify('First Article', allow_unicode=False),
+            body='This is the body of the first article.',
+            topic=cls.topic,
+            added_by=cls.user,
+            is_featured=True
+        )
+
+        cls.second_article = Article.objects.create(
+            title='Second Article',
+            slug=slugify('Second Article', allow_unicode=False),
+            body='This is the body of the second article.',
+            topic=cls.topic,
+            added_by=cls.user
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_pointer_is_served_from_cache(self):
+        self.assertEqual(featured_article().title, 'First Article')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(featured_article().title, 'First Article')
+
+    def test_home_page_works_without_a_featured_article(self):
+        Article.objects.update(is_featured=False)
+
+        response = self.client.get(reverse('pages:index'))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'Featured article')
+
+    def test_switch_replaces_the_featured_article(self):
+        self.assertContains(self.client.get(reverse('pages:index')), 'First Article')
+
+        set_featured_article(self.second_article)
+
+        self.assertEqual(list(Article.objects.filter(is_featured=True)), [self.second_article])
+        with self.assertNumQueries(0):
+            self.assertEqual(featured_article().title, 'Second Article')
+        self.assertEqual(self.client.get(reverse('pages:index')).context['featured_article'].title,
+                         'Second Article')
+
+    def test_concurrent_switches_do_not_fail(self):
+        lookups = []
+
+        def featured_ids(exclude_pk):
+            # the first lookup runs before a concurrent switch to the first
+            # article commits, so it finds nothing to lock
+            lookups.append(exclude_pk)
+            return [] if len(lookups) == 1 else real_featured_ids(exclude_pk)
+
+        with mock.patch('posts.featured.featured_ids', side_effect=featured_ids):
+            set_featured_article(self.second_article)
+
+        self.assertEqual(len(lookups), 2)
+        self.assertEqual(list(Article.objects.filter(is_featured=True)), [self.second_article])
+
+    def test_only_one_article_can_be_featured(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Article.objects.filter(pk=self.second_article.pk).update(is_featured=True)
+
+    def test_pointer_follows_edits(self):
+        featured_article()
+
+        self.first_article.title = 'First Article Renamed'
+        self.first_article.save()
+
+        self.assertEqual(featured_article().title, 'First Article Renamed')
+
+    def test_set_as_featured_article_view(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse(
+            'posts:set_as_featured_article', args=[self.second_article.slug]))
+
+        self.assertRedirects(response, reverse('posts:articles'))
+        self.assertEqual(featured_article().title, 'Second Article')
@@ -0,0 +1,97 @@
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.text import slugify
+
+from accounts.models import UserModel
+from posts.models import Topic, Article, Comment, Like
+
+
+@skipUnless(connection.vendor == 'sqlite', 'reads SQLite query plans')
+class ActiveIndexPlanTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890',
+            is_active=True
+        )
+
+        cls.topic = Topic.objects.create(
+            title='First Topic',
+            slug=slugify('First Topic', allow_unicode=False),
+            description='This is the first topic.',
+            added_by=cls.user
+        )
+
+        cls.article = Article.objects.create(
+            title='First Article',
+            slug=slugify('First Article', allow_unicode=False),
+            body='This is the body of the first article.',
+            topic=cls.topic,
+            added_by=cls.user
+        )
+
+        comment = Comment.objects.create(
+            title='First Comment',
+            slug=slugify('First Comment', allow_unicode=False),
+            body='This is a comment.',
+            article=cls.article,
+            added_by=cls.user
+        )
+
+        Like.objects.create(
+            slug=slugify('First Like', allow_unicode=False),
+            comment=comment,
+            added_by=cls.user
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def query_plans(self, url, table, **params):
+        # EXPLAIN QUERY PLAN for every ordered SELECT the view runs on `table`
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url, params).status_code, 200)
+
+        plans = []
+        with connection.cursor() as cursor:
+            for query in queries:
+                sql = query['sql']
+                if sql.startswith('SELECT') and 'FROM "' + table + '"' in sql and 'ORDER BY' in sql:
+                    cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                    plans.append(' '.join(str(row[-1]) for row in cursor.fetchall()))
+
+        self.assertTrue(plans, 'no ordered query on ' + table)
+        return ' '.join(plans)
+
+    def test_article_lists_use_active_indexes(self):
+        self.assertIn('posts_art_active_created_idx', self.query_plans(
+            reverse('pages:articles'), 'posts_article'))
+        # the topic pages build this list without rendering it yet
+        self.assertIn('posts_art_topic_updated_idx', Article.objects.filter(
+            topic=self.topic, is_active=True).order_by('-updated_at', '-id').explain())
+        self.assertIn('posts_art_author_updated_idx', self.query_plans(
+            reverse('pages:author', args=[self.user.username]), 'posts_article'))
+
+    def test_comment_and_like_lists_use_active_indexes(self):
+        self.assertIn('posts_com_article_updated_idx', self.query_plans(
+            reverse('pages:article', args=[self.article.slug]), 'posts_comment'))
+        self.assertIn('posts_com_author_updated_idx', self.query_plans(
+            reverse('pages:author', args=[self.user.username]), 'posts_comment', tab='comments'))
+        self.assertIn('posts_like_author_updated_idx', self.query_plans(
+            reverse('pages:author', args=[self.user.username]), 'posts_like', tab='likes'))
+
+    def test_dashboard_lists_use_active_indexes(self):
+        self.client.force_login(self.user)
+
+        self.assertIn('posts_art_author_updated_idx', self.query_plans(
+            reverse('posts:articles'), 'posts_article'))
+        self.assertIn('accounts_active_created_idx', self.query_plans(
+            reverse('pages:authors'), 'accounts_usermodel'))
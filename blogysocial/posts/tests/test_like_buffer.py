@@ -0,0 +1,137 @@
+from io import StringIO
+from unittest import mock
+import glob
+import os
+import tempfile
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.utils.text import slugify
+
+from accounts.models import UserModel
+from posts.like_buffer import LikeBuffer, apply_records
+from posts.likes import liked_ids, toggle_like
+from posts.models import Topic, Article, Like
+
+
+@override_settings(LIKES_WRITE_BEHIND=True)
+class LikeBufferTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890',
+            is_active=True
+        )
+
+        cls.topic = Topic.objects.create(
+            title='First Topic',
+            slug=slugify('First Topic', allow_unicode=False),
+            description='This is the first topic.',
+            added_by=cls.user
+        )
+
+        cls.article = Article.objects.create(
+            title='First Article',
+            slug=slugify('First Article', allow_unicode=False),
+            body='This is the body of the first article.',
+            topic=cls.topic,
+            added_by=cls.user
+        )
+
+    def setUp(self):
+        cache.clear()
+
+        journal_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(journal_dir.cleanup)
+        self.journal_dir = journal_dir.name
+
+        self.buffer = LikeBuffer(self.journal_dir)
+        patcher = mock.patch('posts.likes.get_like_buffer', return_value=self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def article_likes(self):
+        self.article.refresh_from_db()
+        return self.article.likes_count
+
+    def test_toggles_are_journaled_and_counted_before_they_are_written(self):
+        self.assertEqual(toggle_like(self.user, self.article), (True, 1))
+
+        self.assertFalse(Like.objects.exists())
+        self.assertEqual(self.article_likes(), 0)
+        with open(self.buffer.journal_path) as journal:
+            self.assertIn('"liked": true', journal.read())
+
+    def test_flush_writes_likes_and_counters(self):
+        toggle_like(self.user, self.article)
+        self.assertEqual(self.buffer.flush(), 1)
+
+        self.assertTrue(Like.objects.filter(article=self.article, like_dislike=True).exists())
+        self.assertEqual(self.article_likes(), 1)
+        self.assertEqual(self.buffer.pending, {})
+        self.assertEqual(glob.glob(os.path.join(self.journal_dir, '*')), [])
+
+        self.assertEqual(toggle_like(self.user, self.article), (False, 0))
+        self.buffer.flush()
+        self.assertEqual(self.article_likes(), 0)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.likes_count, 0)
+
+    def test_toggles_cancel_out_before_a_flush(self):
+        toggle_like(self.user, self.article)
+        self.assertEqual(toggle_like(self.user, self.article), (False, 0))
+
+        self.buffer.flush()
+        self.assertFalse(Like.objects.filter(like_dislike=True).exists())
+        self.assertEqual(self.article_likes(), 0)
+
+    def test_like_state_includes_pending_toggles(self):
+        toggle_like(self.user, self.article)
+
+        self.assertEqual(liked_ids(self.user, 'article', [self.article.pk]), {self.article.pk})
+
+        self.buffer.flush()
+        toggle_like(self.user, self.article)
+        self.assertEqual(liked_ids(self.user, 'article', [self.article.pk]), set())
+
+    def test_failed_flushes_keep_their_claim(self):
+        toggle_like(self.user, self.article)
+
+        with mock.patch('posts.like_buffer.apply_records', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.buffer.flush()
+
+        self.assertFalse(Like.objects.exists())
+        self.assertEqual(toggle_like(self.user, self.topic), (True, 1))
+        self.assertEqual(liked_ids(self.user, 'article', [self.article.pk]), {self.article.pk})
+
+        self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(Like.objects.filter(like_dislike=True).count(), 2)
+        self.assertEqual(self.article_likes(), 1)
+        self.assertEqual(self.buffer.pending, {})
+        self.assertEqual(glob.glob(os.path.join(self.journal_dir, '*')), [])
+
+    def test_replayed_journals_are_harmless(self):
+        records = [{'target': 'article', 'id': self.article.pk, 'user': self.user.pk, 'liked': True}]
+
+        apply_records(records)
+        apply_records(records)
+
+        self.assertEqual(Like.objects.count(), 1)
+        self.assertEqual(self.article_likes(), 1)
+
+    def test_journals_of_stopped_processes_are_recovered(self):
+        toggle_like(self.user, self.topic)
+        toggle_like(self.user, self.article)
+
+        out = StringIO()
+        call_command('flush_like_journal', journal_dir=self.journal_dir, stdout=out)
+
+        self.assertIn('2 journaled likes written', out.getvalue())
+        self.assertEqual(Like.objects.filter(like_dislike=True).count(), 2)
+        self.assertEqual(self.article_likes(), 1)
@@ -0,0 +1,156 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.text import slugify
+
+from accounts.models import UserModel
+from posts.likes import toggle_like
+from posts.models import Topic, Article, Comment, Like
+
+
+class ToggleLikeTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890',
+            is_active=True
+        )
+
+        cls.topic = Topic.objects.create(
+            title='First Topic',
+            slug=slugify('First Topic', allow_unicode=False),
+            description='This is the first topic.',
+            added_by=cls.user
+        )
+
+        cls.article = Article.objects.create(
+            title='First Article',
+            slug=slugify('First Article', allow_unicode=False),
+            body='This is the body of the first article.',
+            topic=cls.topic,
+            added_by=cls.user
+        )
+
+        cls.comment = Comment.objects.create(
+            title='First Comment',
+            slug=slugify('First Comment', allow_unicode=False),
+            body='This is a comment.',
+            article=cls.article,
+            added_by=cls.user
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_toggle_flips_a_single_row(self):
+        self.assertEqual(toggle_like(self.user, self.article), (True, 1))
+        self.assertEqual(toggle_like(self.user, self.article), (False, 0))
+        self.assertEqual(toggle_like(self.user, self.article), (True, 1))
+
+        self.assertEqual(Like.objects.filter(article=self.article).count(), 1)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.likes_count, 1)
+
+    def test_toggle_without_upserts(self):
+        with mock.patch.object(connection, 'vendor', 'mysql'):
+            self.assertEqual(toggle_like(self.user, self.article), (True, 1))
+            self.assertEqual(toggle_like(self.user, self.article), (False, 0))
+
+        self.assertEqual(Like.objects.filter(article=self.article).count(), 1)
+
+    def test_each_target_type_is_counted(self):
+        self.assertEqual(toggle_like(self.user, self.topic), (True, 1))
+        self.assertEqual(toggle_like(self.user, self.comment), (True, 1))
+        self.assertEqual(toggle_like(self.user, self.comment), (False, 0))
+
+        self.assertEqual(Like.objects.filter(topic=self.topic).count(), 1)
+        self.assertEqual(Like.objects.filter(comment=self.comment).count(), 1)
+
+    def test_removed_likes_come_back_as_likes(self):
+        toggle_like(self.user, self.article)
+        Like.objects.filter(article=self.article).update(is_active=False)
+
+        self.assertTrue(toggle_like(self.user, self.article).liked)
+
+    def test_duplicate_likes_are_rejected(self):
+        toggle_like(self.user, self.article)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Like.objects.create(
+                slug=slugify('Duplicate Like', allow_unicode=False),
+                article=self.article,
+                added_by=self.user
+            )
+
+    def test_like_views(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('posts:add_remove_topic_like', args=[self.topic.slug]))
+        self.assertRedirects(response, reverse('pages:topic', args=[self.topic.slug]))
+
+        response = self.client.get(reverse('posts:add_remove_comment_like', args=[self.comment.slug]))
+        self.assertRedirects(response, reverse('pages:article', args=[self.article.slug]))
+
+        self.assertEqual(Like.objects.filter(like_dislike=True).count(), 2)
+
+
+class ToggleLikeJsonTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890',
+            is_active=True
+        )
+
+        cls.topic = Topic.objects.create(
+            title='First Topic',
+            slug=slugify('First Topic', allow_unicode=False),
+            description='This is the first topic.',
+            added_by=cls.user
+        )
+
+        cls.article = Article.objects.create(
+            title='First Article',
+            slug=slugify('First Article', allow_unicode=False),
+            body='This is the body of the first article.',
+            topic=cls.topic,
+            added_by=cls.user
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('posts:toggle_like', args=['articles', self.article.slug])
+
+    def test_toggle_returns_state_and_count(self):
+        self.client.force_login(self.user)
+
+        response = self.client.post(self.url)
+        self.assertEqual(response.json(), {'liked': True, 'likes_count': 1})
+        self.assertEqual(self.client.post(self.url).json(), {'liked': False, 'likes_count': 0})
+
+        # no message is left behind for the next page
+        self.assertNotContains(self.client.get(
+            reverse('pages:article', args=[self.article.slug])), 'You reacted')
+
+    def test_requests_are_checked(self):
+        self.assertEqual(self.client.post(self.url).status_code, 401)
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+        self.assertEqual(self.client.post(reverse(
+            'posts:toggle_like', args=['users', self.user.username])).status_code, 404)
+
+    def test_article_page_wires_the_script(self):
+        response = self.client.get(reverse('pages:article', args=[self.article.slug]))
+
+        self.assertContains(response, 'data-like-url="' + self.url + '"')
+        self.assertContains(response, 'js/likes.js')
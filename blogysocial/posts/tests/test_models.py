@@ -1,9 +1,16 @@
 from datetime import datetime
+from io import StringIO
 
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.forms import modelform_factory
 from django.test import TestCase
 from django.utils.text import slugify
 
 from accounts.models import UserModel
+from posts.forms import ArticleForm
+from posts.hashing import body_hash
 from posts.models import Topic, Article, Comment, Like
 
 
@@ -280,8 +287,8 @@ class ArticleModelTest(TestCase):
 
     def test_body_unique(self):
         article = Article.objects.get(id=1)
-        unique = article._meta.get_field('body').unique
-        self.assertEqual(unique, True)
+        self.assertEqual(article._meta.get_field('body').unique, False)
+        self.assertEqual(article._meta.get_field('body_hash').unique, True)
 
     def test_is_featured_default(self):
         article = Article.objects.get(id=1)
@@ -351,6 +358,155 @@ class ArticleModelTest(TestCase):
         self.assertEqual(str(article), expected_object)
 
 
+class ArticleBodyHashTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890'
+        )
+        cls.topic = Topic.objects.create(
+            title='Topic for Article',
+            description='This is the topic for article test.',
+            added_by=cls.user
+        )
+        cls.article = Article.objects.create(
+            title='First Article',
+            slug=slugify('First Article', allow_unicode=False),
+            body='<p>This is the first article.</p>',
+            topic=cls.topic,
+            added_by=cls.user
+        )
+
+    def test_equivalent_bodies_share_a_hash(self):
+        self.assertEqual(
+            body_hash('<p>This is the first article.</p>'),
+            body_hash('<P>This  is the&nbsp;first\narticle.</P>\n<p>&nbsp;</p>'))
+        self.assertNotEqual(
+            body_hash('<p>This is the first article.</p>'),
+            body_hash('<p>This is the second article.</p>'))
+
+    def test_hash_is_stored_on_save(self):
+        self.assertEqual(self.article.body_hash, body_hash(self.article.body))
+
+        self.article.body = '<p>An edited body.</p>'
+        self.article.save(update_fields=['body'])
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.body_hash, body_hash('<p>An edited body.</p>'))
+
+    def test_duplicate_bodies_are_rejected(self):
+        form = ArticleForm(data={
+            'title': 'Second Article',
+            'body': '<p>This is the  first article.</p>',
+            'topic': self.topic.pk,
+        })
+        self.assertFalse(form.is_valid())
+        self.assertIn('body', form.errors)
+
+        form = ArticleForm(instance=self.article, data={
+            'title': 'First Article',
+            'body': '<p>This is the first article.</p>',
+            'topic': self.topic.pk,
+        })
+        self.assertTrue(form.is_valid())
+
+        with self.assertRaises(IntegrityError):
+            Article.objects.create(
+                title='Second Article',
+                slug=slugify('Second Article', allow_unicode=False),
+                body='<p>This is the first article. </p>',
+                topic=self.topic,
+                added_by=self.user
+            )
+
+    def test_unhashed_duplicates_can_still_be_saved(self):
+        Article.objects.bulk_create([Article(
+            title='Second Article',
+            slug=slugify('Second Article', allow_unicode=False),
+            body='<p>This is the first article.</p>',
+            topic=self.topic,
+            added_by=self.user
+        )])
+        duplicate = Article.objects.get(slug='second-article')
+        self.assertIsNone(duplicate.body_hash)
+
+        duplicate.is_active = False
+        duplicate.save()
+        self.assertIsNone(Article.objects.get(pk=duplicate.pk).body_hash)
+
+        duplicate.body = '<p>This is the first article. </p>'
+        with self.assertRaises(ValidationError):
+            duplicate.full_clean()
+
+        duplicate.body = '<p>This is the second article.</p>'
+        duplicate.full_clean()
+        duplicate.save()
+        self.assertEqual(Article.objects.get(pk=duplicate.pk).body_hash,
+                         body_hash('<p>This is the second article.</p>'))
+
+    def test_admin_forms_reject_duplicate_bodies(self):
+        form = modelform_factory(Article, fields=['title', 'slug', 'body', 'topic', 'added_by'])(data={
+            'title': 'Second Article',
+            'slug': 'second-article',
+            'body': '<p>This is the first article.</p>',
+            'topic': self.topic.pk,
+            'added_by': self.user.pk,
+        })
+        self.assertFalse(form.is_valid())
+        self.assertIn('body', form.errors)
+
+    def test_hash_article_bodies_command(self):
+        Article.objects.update(body_hash=None)
+
+        call_command('hash_article_bodies', batch_size=1, stdout=StringIO())
+        self.assertEqual(Article.objects.get(pk=self.article.pk).body_hash,
+                         body_hash(self.article.body))
+
+
+class ArticleSummaryTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890'
+        )
+        topic = Topic.objects.create(
+            title='Topic for Article',
+            description='This is the topic for article test.',
+            added_by=user
+        )
+        cls.article = Article.objects.create(
+            title='First Article',
+            slug=slugify('First Article', allow_unicode=False),
+            body='<h2>Intro</h2><p>Fish &amp; chips</p><p>' + 'word ' * 399 + '</p>',
+            topic=topic,
+            added_by=user
+        )
+
+    def test_summary_is_derived_on_save(self):
+        self.assertEqual(self.article.word_count, 403)
+        self.assertEqual(self.article.reading_time, 3)
+        self.assertTrue(self.article.excerpt.startswith('Intro Fish & chips word'))
+        self.assertNotIn('<', self.article.excerpt)
+        self.assertEqual(len(self.article.excerpt.split()), 60)
+
+        self.article.body = '<p>Short</p>'
+        self.article.save(update_fields=['body'])
+        self.article.refresh_from_db()
+        self.assertEqual((self.article.excerpt, self.article.word_count, self.article.reading_time),
+                         ('Short', 1, 1))
+
+    def test_summarize_articles_command(self):
+        Article.objects.update(excerpt='', word_count=0, reading_time=0)
+
+        call_command('summarize_articles', batch_size=1, stdout=StringIO())
+        self.assertEqual(Article.objects.get(pk=self.article.pk).word_count, 403)
+
+
 class CommentModelTest(TestCase):
     @classmethod
     def setUpTestData(cls):
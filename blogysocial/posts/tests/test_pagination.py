@@ -0,0 +1,193 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils.text import slugify
+
+from accounts.models import UserModel
+from posts.models import Topic, Article, Comment
+from posts.pagination import EstimatedCountPaginator, KeysetPaginator, paginate
+
+
+class KeysetPaginatorTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890'
+        )
+
+        for number in range(12):
+            Topic.objects.create(
+                title='Topic ' + str(number),
+                slug=slugify('Topic ' + str(number), allow_unicode=False),
+                description='This is a topic.',
+                added_by=user
+            )
+
+        # identical timestamps force the id tie-breaker to do the work
+        Topic.objects.filter(title__in=['Topic 3', 'Topic 4', 'Topic 5']).update(
+            created_at=Topic.objects.get(title='Topic 3').created_at)
+
+    def setUp(self):
+        self.queryset = Topic.objects.all()
+        self.expected = list(self.queryset.order_by('-created_at', '-id'))
+
+    def test_walking_cursors_matches_offset_order(self):
+        paginator = KeysetPaginator(self.queryset, per_page=5)
+        page = paginator.get_page(1)
+        seen = list(page)
+
+        while page.has_next():
+            page = paginator.cursor_page(page.next_cursor)
+            seen.extend(page)
+
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(page.number, 3)
+
+    def test_previous_cursor_returns_previous_page(self):
+        paginator = KeysetPaginator(self.queryset, per_page=5)
+        second = paginator.cursor_page(paginator.get_page(1).next_cursor)
+        first = paginator.cursor_page(second.previous_cursor)
+
+        self.assertEqual(list(first), self.expected[:5])
+        self.assertEqual(first.number, 1)
+        self.assertFalse(first.has_previous())
+
+    def test_cursor_page_needs_no_count(self):
+        paginator = KeysetPaginator(self.queryset, per_page=5)
+        cursor = paginator.get_page(1).next_cursor
+
+        with self.assertNumQueries(1):
+            page = KeysetPaginator(self.queryset, per_page=5).cursor_page(cursor)
+            self.assertEqual(list(page), self.expected[5:10])
+            self.assertTrue(page.has_next())
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        request = RequestFactory().get('/', {'cursor': 'tampered'})
+        page = paginate(request, self.queryset, 2, per_page=5)
+
+        self.assertEqual(page.number, 1)
+        self.assertEqual(list(page), self.expected[:5])
+
+
+class EstimatedCountPaginatorTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890'
+        )
+
+        for number in range(6):
+            Topic.objects.create(
+                title='Topic ' + str(number),
+                slug=slugify('Topic ' + str(number), allow_unicode=False),
+                description='This is a topic.',
+                added_by=user
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.queryset = Topic.objects.order_by('-id')
+
+    def test_small_sets_are_counted_exactly(self):
+        with mock.patch.object(EstimatedCountPaginator, 'refresh_count_later') as refresh:
+            self.assertEqual(EstimatedCountPaginator(self.queryset, per_page=2).count, 6)
+            self.assertEqual(EstimatedCountPaginator(
+                self.queryset.filter(title='Topic 1'), per_page=2).count, 1)
+
+        refresh.assert_not_called()
+
+    @mock.patch('posts.pagination.EXACT_COUNT_THRESHOLD', 3)
+    def test_large_sets_use_bounded_count_then_refresh(self):
+        paginator = EstimatedCountPaginator(self.queryset, per_page=2)
+
+        with mock.patch.object(EstimatedCountPaginator, 'refresh_count_later') as refresh:
+            # sqlite has no planner estimate, so the lower bound is served
+            self.assertEqual(paginator.count, 4)
+
+        refresh.assert_called_once_with(paginator.count_cache_key())
+
+    @mock.patch('posts.pagination.EXACT_COUNT_THRESHOLD', 3)
+    def test_large_sets_use_cached_count(self):
+        paginator = EstimatedCountPaginator(self.queryset, per_page=2)
+        cache.set(paginator.count_cache_key(), (6, time.time()))
+
+        with mock.patch.object(EstimatedCountPaginator, 'refresh_count_later') as refresh:
+            self.assertEqual(paginator.count, 6)
+            self.assertEqual(paginator.num_pages, 3)
+
+        refresh.assert_not_called()
+
+        cache.set(paginator.count_cache_key(), (6, time.time() - 3600))
+        with mock.patch.object(EstimatedCountPaginator, 'refresh_count_later') as refresh:
+            self.assertEqual(EstimatedCountPaginator(self.queryset, per_page=2).count, 6)
+
+        refresh.assert_called_once()
+
+    def test_keyset_paginator_opts_in(self):
+        self.assertTrue(issubclass(KeysetPaginator, EstimatedCountPaginator))
+
+
+class DashboardListsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890',
+            is_active=True
+        )
+        other = UserModel.objects.create(
+            username='user3',
+            email='user3@user3.com',
+            name='User Three',
+            password='1234567890',
+            is_active=True
+        )
+
+        topic = Topic.objects.create(
+            title='First Topic',
+            slug=slugify('First Topic', allow_unicode=False),
+            description='This is the first topic.',
+            added_by=cls.user
+        )
+        article = Article.objects.create(
+            title='First Article',
+            slug=slugify('First Article', allow_unicode=False),
+            body='This is the body of the first article.',
+            topic=topic,
+            added_by=cls.user
+        )
+
+        for number in range(7):
+            Comment.objects.create(
+                title='Comment ' + str(number),
+                slug=slugify('Comment ' + str(number), allow_unicode=False),
+                body='This is a comment.',
+                article=article,
+                added_by=other
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_comments_by_others_link_to_their_next_page(self):
+        response = self.client.get(reverse('posts:comments'))
+        first_page = response.context['comments_by_others_on_my_articles_objects']
+        self.assertEqual(len(first_page), 5)
+        self.assertContains(response, '?others_cursor=' + first_page.next_cursor)
+
+        response = self.client.get(reverse('posts:comments'), {'others_cursor': first_page.next_cursor})
+        second_page = response.context['comments_by_others_on_my_articles_objects']
+        self.assertEqual(len(second_page), 2)
+        self.assertContains(response, '?others_cursor=' + second_page.previous_cursor)
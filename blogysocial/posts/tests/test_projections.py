@@ -0,0 +1,74 @@
+import pickle
+
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils.text import slugify
+
+from accounts.models import UserModel
+from posts.models import Topic, Article
+from posts.pagination import paginate
+from posts.projections import ArticleRow
+
+
+class ArticleRowsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890',
+            is_active=True
+        )
+
+        cls.topic = Topic.objects.create(
+            title='First Topic',
+            slug=slugify('First Topic', allow_unicode=False),
+            description='This is the first topic.',
+            added_by=cls.user
+        )
+
+        for number in range(12):
+            Article.objects.create(
+                title='Article ' + str(number),
+                slug=slugify('Article ' + str(number), allow_unicode=False),
+                body='<p>This is the body of article ' + str(number) + '.</p>',
+                topic=cls.topic,
+                added_by=cls.user
+            )
+
+    def test_rows_carry_list_columns_and_joined_relations(self):
+        with self.assertNumQueries(1):
+            rows = list(Article.objects.order_by('-id').as_rows())
+
+        row = rows[0]
+        self.assertIsInstance(row, ArticleRow)
+        self.assertFalse(hasattr(row, '__dict__'))
+        self.assertFalse(hasattr(row, 'body'))
+        self.assertEqual(row.title, 'Article 11')
+        self.assertEqual(row.excerpt, 'This is the body of article 11.')
+        self.assertEqual(row.topic.title, 'First Topic')
+        self.assertEqual(row.added_by.name, 'User Two')
+        self.assertEqual(row.added_by, self.user)
+        self.assertEqual(row.image, 'images/default.png')
+
+    def test_rows_survive_the_cache(self):
+        row = pickle.loads(pickle.dumps(Article.objects.as_rows().first()))
+        self.assertEqual(row.topic.title, 'First Topic')
+
+    def test_rows_can_be_paginated_by_cursor(self):
+        request = RequestFactory().get('/')
+        queryset = Article.objects.as_rows()
+
+        first = paginate(request, queryset, 1, ordering=('-updated_at', '-id'))
+        second = paginate(RequestFactory().get('/', {'cursor': first.next_cursor}), queryset,
+                          ordering=('-updated_at', '-id'))
+
+        self.assertEqual([row.title for row in second], ['Article 1', 'Article 0'])
+
+    def test_dashboard_list_renders_rows(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('posts:articles'))
+        self.assertContains(response, 'This is the body of article 11.')
+        self.assertIsInstance(response.context['article_objects'][0], ArticleRow)
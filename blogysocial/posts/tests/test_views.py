@@ -1,5 +1,7 @@
 from datetime import datetime
+from io import StringIO
 
+from django.core.management import call_command
 from django.test import TestCase
 from django.urls import reverse
 from django.utils.text import slugify
@@ -57,3 +59,74 @@ class TopicIndexView(TestCase):
         response = self.client.get(reverse('posts:topics'))
         self.assertEqual(response.status_code, 302)
         self.assertTrue(response.url.startswith('/topics/'))
+
+
+class EngagementCountersTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserModel.objects.create(
+            username='user2',
+            email='user2@user2.com',
+            name='User Two',
+            password='1234567890',
+            is_active=True
+        )
+
+        cls.topic = Topic.objects.create(
+            title='This is topic 1',
+            slug=slugify('This is topic 1', allow_unicode=False),
+            description='This is the description of the topic',
+            added_by=cls.user
+        )
+
+        cls.article = Article.objects.create(
+            title='This is article 1',
+            slug=slugify('This is article 1', allow_unicode=False),
+            body='This is the body of the article',
+            topic=cls.topic,
+            added_by=cls.user
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_comment_create_and_delete_update_counters(self):
+        self.client.post(reverse('posts:add_comment', args=[self.article.slug]), {
+            'title': 'This is a comment',
+            'body': 'This is the body of the comment'
+        })
+
+        self.article.refresh_from_db()
+        self.user.refresh_from_db()
+        self.assertEqual(self.article.comments_count, 1)
+        self.assertEqual(self.user.comments_count, 1)
+
+        comment = Comment.objects.get(article=self.article)
+        self.client.get(reverse('posts:delete_comment', args=[comment.slug]))
+
+        self.article.refresh_from_db()
+        self.user.refresh_from_db()
+        self.assertEqual(self.article.comments_count, 0)
+        self.assertEqual(self.user.comments_count, 0)
+
+    def test_like_toggle_updates_counters(self):
+        url = reverse('posts:add_remove_article_like', args=[self.article.slug])
+
+        self.client.get(url)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 1)
+
+        self.client.get(url)
+        self.article.refresh_from_db()
+        self.user.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 0)
+        self.assertEqual(self.user.likes_count, 0)
+
+    def test_reconcile_counters_command(self):
+        call_command('reconcile_counters', stdout=StringIO())
+
+        self.topic.refresh_from_db()
+        self.user.refresh_from_db()
+        self.assertEqual(self.topic.articles_count, 1)
+        self.assertEqual(self.user.topics_count, 1)
+        self.assertEqual(self.user.articles_count, 1)
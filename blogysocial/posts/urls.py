@@ -62,7 +62,9 @@ urlpatterns = [
     path('likes/articles/<slug:article_slug>/',
          views.add_remove_article_like, name='add_remove_article_like'),
     path('likes/comments/<slug:comment_slug>/',
-         views.add_remove_comment_like, name='add_remove_comment_like')
+         views.add_remove_comment_like, name='add_remove_comment_like'),
+    path('likes/<str:target>/<slug:slug>/toggle/',
+         views.toggle_like_json, name='toggle_like')
 
 
     # Reactions
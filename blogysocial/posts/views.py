@@ -3,15 +3,21 @@ import random
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
-from django.http import HttpResponse, HttpResponseRedirect
+from django.db import transaction
+from django.http import Http404, HttpResponse, HttpResponseRedirect, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
+from django.views.decorators.http import require_POST
 
 from accounts.models import UserModel
+from .activities import author_activities
+from .counters import increment_counters
+from .featured import set_featured_article
+from .likes import toggle_like
 from .models import Topic, Article, Comment, Like
+from .pagination import paginate
 from .forms import TopicForm, ArticleForm, CommentForm
 
 
@@ -37,7 +43,10 @@ def add_topic(request):
             topic.representative_color = random.choice(
                 ['primary', 'secondary', 'success', 'info', 'warning', 'danger'])
             topic.added_by = request.user
-            topic.save()
+
+            with transaction.atomic():
+                topic.save()
+                increment_counters(UserModel, request.user.pk, topics_count=1)
 
             messages.success(request, topic.title + ' added')
 
@@ -57,7 +66,7 @@ def view_topic(request, topic_slug):
         Topic, slug=topic_slug, is_active=True)
 
     articles_belonging_to_topic = Article.objects.filter(
-        topic=topic, is_active=True).order_by('-updated_at')
+        topic=topic, is_active=True).order_by('-updated_at').as_rows()
 
     return render(request, 'posts/topics/topic.html', {
         'topic': topic,
@@ -98,7 +107,10 @@ def delete_topic(request, topic_slug):
     else:
         topic.is_active = False
         topic.deleted_at = datetime.now()
-        topic.save()
+
+        with transaction.atomic():
+            topic.save()
+            increment_counters(UserModel, topic.added_by_id, topics_count=-1)
 
         messages.warning(request, 'Topic removed')
 
@@ -110,15 +122,14 @@ def delete_topic(request, topic_slug):
 def articles(request):
     if request.user.is_staff:
         articles = Article.objects.filter(
-            is_active=True).order_by('-updated_at')
+            is_active=True).order_by('-updated_at').as_rows()
     else:
         articles = Article.objects.filter(
-            added_by=request.user, is_active=True).order_by('-updated_at')
+            added_by=request.user, is_active=True).order_by('-updated_at').as_rows()
 
     articles_count = articles.count()
-    paginator = Paginator(articles, per_page=10)
-    article_objects = paginator.get_page(1)
-    article_objects.adjusted_elided_pages = paginator.get_elided_page_range(1)
+    article_objects = paginate(
+        request, articles, 1, ordering=('-updated_at', '-id'))
 
     return render(request, 'posts/articles/index.html', {
         'articles': articles,
@@ -131,15 +142,13 @@ def articles(request):
 def articles_pages(request, page=1):
     if request.user.is_staff:
         articles = Article.objects.filter(
-            is_active=True).order_by('-updated_at')
+            is_active=True).order_by('-updated_at').as_rows()
     else:
         articles = Article.objects.filter(
-            added_by=request.user, is_active=True).order_by('-updated_at')
+            added_by=request.user, is_active=True).order_by('-updated_at').as_rows()
 
-    paginator = Paginator(articles, per_page=10)
-    article_objects = paginator.get_page(page)
-    article_objects.adjusted_elided_pages = paginator.get_elided_page_range(
-        page)
+    article_objects = paginate(
+        request, articles, page, ordering=('-updated_at', '-id'))
 
     return render(request, 'posts/articles/index.html', {'article_objects': article_objects})
 
@@ -161,14 +170,19 @@ def add_article(request):
             article.body = article_form.cleaned_data['body']
             article.image = article_form.cleaned_data['image']
             article.added_by = request.user
-            article.save()
+
+            with transaction.atomic():
+                article.save()
+                increment_counters(Topic, article.topic_id, articles_count=1)
+                increment_counters(
+                    UserModel, request.user.pk, articles_count=1)
 
             messages.success(request, article.title + ' added.')
 
             return HttpResponseRedirect(reverse('posts:articles'))
         else:
             messages.warning(
-                request, article.title + ' not added')
+                request, request.POST.get('title', 'Article') + ' not added')
 
     else:
         article_form = ArticleForm()
@@ -199,10 +213,19 @@ def update_article(request, article_slug):
         article = get_object_or_404(
             Article, slug=article_slug, added_by=request.user, is_active=True)
 
+    previous_topic_id = article.topic_id
+
     if (request.method == 'POST' and article.added_by == request.user) | (request.method == 'POST' and request.user.is_staff):
         article_form = ArticleForm(instance=article, data=request.POST)
         if article_form.is_valid():
-            article_form.save()
+            with transaction.atomic():
+                article = article_form.save()
+
+                if article.topic_id != previous_topic_id:
+                    increment_counters(
+                        Topic, previous_topic_id, articles_count=-1)
+                    increment_counters(
+                        Topic, article.topic_id, articles_count=1)
             return HttpResponseRedirect(reverse('posts:articles'))
 
     else:
@@ -216,9 +239,10 @@ def update_article(request, article_slug):
 
 @login_required
 def set_as_featured_article(request, article_slug):
-    Article.objects.filter(is_featured=True).update(is_featured=False)
-    Article.objects.filter(article__slug=article_slug,
-                           is_featured=False).update(is_featured=True)
+    article = get_object_or_404(
+        Article, slug=article_slug, is_active=True)
+
+    set_featured_article(article)
 
     return HttpResponseRedirect(reverse('posts:articles'))
 
@@ -239,7 +263,12 @@ def delete_article(request, article_slug):
     elif (article.added_by == request.user) | (request.user.is_staff == False):
         article.is_active = False
         article.deleted_at = datetime.now()
-        article.save()
+
+        with transaction.atomic():
+            article.save()
+            increment_counters(Topic, article.topic_id, articles_count=-1)
+            increment_counters(
+                UserModel, article.added_by_id, articles_count=-1)
 
         messages.success(request, 'Article "' + article.title + '" removed.')
 
@@ -262,34 +291,23 @@ def view_author(request, username):
     author = get_object_or_404(
         UserModel, username=username, is_active=True)
 
-    topics_by_author = Topic.objects.filter(
-        added_by=author, is_active=True).order_by('-updated_at')
+    tab, activities = author_activities(request, author)
 
-    articles_by_author = Article.objects.filter(
-        added_by=author, is_active=True).order_by('-updated_at')
+    context = {
+        'author': author,
+        'tab': tab,
+        'activities': activities,
+        'article_url': 'posts:view_article',
+        'topics_count': author.topics_count,
+        'articles_count': author.articles_count,
+        'comments_count': author.comments_count,
+        'likes_count': author.likes_count
+    }
 
-    comments_by_author = Comment.objects.filter(
-        added_by=author, is_active=True).order_by('-updated_at')
+    if request.GET.get('fragment'):
+        return render(request, 'includes/author_activities.html', context)
 
-    likes_by_author = Like.objects.filter(
-        added_by=author, is_active=True).order_by('-updated_at')
-
-    topics_count = topics_by_author.count()
-    articles_count = articles_by_author.count()
-    comments_count = comments_by_author.count()
-    likes_count = likes_by_author.count()
-
-    return render(request, 'posts/authors/author.html', {
-        'author': author,
-        'topics_by_author': topics_by_author,
-        'articles_by_author': articles_by_author,
-        'comments_by_author': comments_by_author,
-        'likes_by_author': likes_by_author,
-        'topics_count': topics_count,
-        'articles_count': articles_count,
-        'comments_count': comments_count,
-        'likes_count': likes_count
-    })
+    return render(request, 'posts/authors/author.html', context)
 
 
 @login_required
@@ -319,19 +337,16 @@ def comments(request):
         comments_by_me = Comment.objects.filter(
             added_by=request.user, is_active=True).order_by('-updated_at')
 
-    paginator = Paginator(comments_by_me, per_page=5)
-    comments_by_me_objects = paginator.get_page(1)
-    comments_by_me_objects.adjusted_elided_pages = paginator.get_elided_page_range(
-        1)
+    comments_by_me_objects = paginate(
+        request, comments_by_me, 1, per_page=5, ordering=('-updated_at', '-id'))
 
     # comments by others on (my) articles
     comments_by_others_on_my_articles = Comment.objects.exclude(
         added_by=request.user).filter(article__added_by=request.user).order_by('-updated_at')
 
-    paginator2 = Paginator(comments_by_others_on_my_articles, per_page=5)
-    comments_by_others_on_my_articles_objects = paginator.get_page(1)
-    comments_by_others_on_my_articles_objects.adjusted_elided_pages = paginator2.get_elided_page_range(
-        1)
+    comments_by_others_on_my_articles_objects = paginate(
+        request, comments_by_others_on_my_articles, 1, per_page=5,
+        ordering=('-updated_at', '-id'), cursor_param='others_cursor')
 
     # general render
     return render(request, 'posts/comments/index.html', {
@@ -350,19 +365,16 @@ def comments_pages(request, page=1):
         comments_by_me = Comment.objects.filter(
             added_by=request.user, is_active=True).order_by('-updated_at')
 
-    paginator = Paginator(comments_by_me, per_page=5)
-    comments_by_me_objects = paginator.get_page(page)
-    comments_by_me_objects.adjusted_elided_pages = paginator.get_elided_page_range(
-        page)
+    comments_by_me_objects = paginate(
+        request, comments_by_me, page, per_page=5, ordering=('-updated_at', '-id'))
 
     # comments by others on my articles
     comments_by_others_on_my_articles = Comment.objects.exclude(added_by=request.user).filter(
         article__added_by=request.user).order_by('-updated_at')
 
-    paginator2 = Paginator(comments_by_others_on_my_articles, per_page=5)
-    comments_by_others_on_my_articles_objects = paginator.get_page(page)
-    comments_by_others_on_my_articles_objects.adjusted_elided_pages = paginator2.get_elided_page_range(
-        page)
+    comments_by_others_on_my_articles_objects = paginate(
+        request, comments_by_others_on_my_articles, page, per_page=5,
+        ordering=('-updated_at', '-id'), cursor_param='others_cursor')
 
     # general render
     return render(request, 'posts/comments/index.html', {
@@ -389,7 +401,12 @@ def add_comment(request, article_slug):
             comment.body = comment_form.cleaned_data['body']
             comment.article = article
             comment.added_by = request.user
-            comment.save()
+
+            with transaction.atomic():
+                comment.save()
+                increment_counters(Article, article.pk, comments_count=1)
+                increment_counters(
+                    UserModel, request.user.pk, comments_count=1)
 
             messages.success(request, comment.title + ' added')
 
@@ -452,7 +469,12 @@ def delete_comment(request, comment_slug):
     elif (comment.added_by == request.user) | (request.user.is_staff == False):
         comment.is_active = False
         comment.deleted_at = datetime.now()
-        comment.save()
+
+        with transaction.atomic():
+            comment.save()
+            increment_counters(Article, comment.article_id, comments_count=-1)
+            increment_counters(
+                UserModel, comment.added_by_id, comments_count=-1)
 
         messages.success(request, 'Comment' + comment.title + ' removed')
 
@@ -471,19 +493,16 @@ def likes(request):
         likes_by_me = Like.objects.filter(
             added_by=request.user, is_active=True).order_by('-updated_at')
 
-    paginator = Paginator(likes_by_me, per_page=5)
-    likes_by_me_objects = paginator.get_page(1)
-    likes_by_me_objects.adjusted_elided_pages = paginator.get_elided_page_range(
-        1)
+    likes_by_me_objects = paginate(
+        request, likes_by_me, 1, per_page=5, ordering=('-updated_at', '-id'))
 
     # likes by others on (my) articles
     likes_by_others_on_my_articles = Like.objects.exclude(
         added_by=request.user).filter(article__added_by=request.user).order_by('-updated_at')
 
-    paginator2 = Paginator(likes_by_others_on_my_articles, per_page=5)
-    likes_by_others_on_my_articles_objects = paginator.get_page(1)
-    likes_by_others_on_my_articles_objects.adjusted_elided_pages = paginator2.get_elided_page_range(
-        1)
+    likes_by_others_on_my_articles_objects = paginate(
+        request, likes_by_others_on_my_articles, 1, per_page=5,
+        ordering=('-updated_at', '-id'), cursor_param='others_cursor')
 
     # general render
     return render(request, 'posts/likes/index.html', {
@@ -527,19 +546,16 @@ def likes_pages(request, page=1):
         likes_by_me = Like.objects.filter(
             added_by=request.user, is_active=True).order_by('-updated_at')
 
-    paginator = Paginator(likes_by_me, per_page=5)
-    likes_by_me_objects = paginator.get_page(page)
-    likes_by_me_objects.adjusted_elided_pages = paginator.get_elided_page_range(
-        page)
+    likes_by_me_objects = paginate(
+        request, likes_by_me, page, per_page=5, ordering=('-updated_at', '-id'))
 
     # likes by others on my articles
     likes_by_others_on_my_articles = Like.objects.exclude(added_by=request.user).filter(
         article__added_by=request.user).order_by('-updated_at')
 
-    paginator2 = Paginator(likes_by_others_on_my_articles, per_page=5)
-    likes_by_others_on_my_articles_objects = paginator.get_page(page)
-    likes_by_others_on_my_articles_objects.adjusted_elided_pages = paginator2.get_elided_page_range(
-        page)
+    likes_by_others_on_my_articles_objects = paginate(
+        request, likes_by_others_on_my_articles, page, per_page=5,
+        ordering=('-updated_at', '-id'), cursor_param='others_cursor')
 
     # general render
     return render(request, 'posts/likes/index.html', {
@@ -550,21 +566,13 @@ def likes_pages(request, page=1):
 
 @login_required
 def add_remove_topic_like(request, topic_slug):
-    like = Like.objects.filter(topic__slug=topic_slug, added_by=request.user)
+    topic = get_object_or_404(
+        Topic, slug=topic_slug, is_active=True)
 
-    if like.exists():
-        Like.objects.filter(like_dislike=True).update(default=False)
-        Like.objects.filter(like_dislike=False).update(default=True)
-    else:
-        Like.objects.create(
-            like_dislike=True,
-            slug=slugify(
-                str(topic_slug) + str(datetime.now()), allow_unicode=False
-            ),
-            added_by=request.user
-        )
+    toggle_like(request.user, topic)
 
     messages.success(request, 'You reacted on this topic')
+    return redirect('pages:topic', topic.slug)
 
 
 @login_required
@@ -572,27 +580,7 @@ def add_remove_article_like(request, article_slug):
     article = get_object_or_404(
         Article, slug=article_slug, is_active=True)
 
-    liked = Like.objects.filter(
-        like_dislike=True, article__slug=article.slug, added_by=request.user).first()
-
-    unliked = Like.objects.filter(
-        like_dislike=False, article__slug=article.slug, added_by=request.user).first()
-
-    if liked:
-        Like.objects.filter(like_dislike=True, article__slug=article.slug,
-                            added_by=request.user).update(like_dislike=False)
-    elif unliked:
-        Like.objects.filter(like_dislike=False, article__slug=article.slug,
-                            added_by=request.user).update(like_dislike=True)
-    elif (liked == None) and (unliked == None):
-        Like.objects.create(
-            like_dislike=True,
-            slug=slugify(
-                str(article_slug) + str(datetime.now()), allow_unicode=False
-            ),
-            article=article,
-            added_by=request.user
-        )
+    toggle_like(request.user, article)
 
     messages.success(request, 'You reacted to this article')
     return redirect('pages:article', article.slug)
@@ -600,21 +588,34 @@ def add_remove_article_like(request, article_slug):
 
 @login_required
 def add_remove_comment_like(request, comment_slug):
-    like = Like.objects.get(comment__slug=comment_slug, added_by=request.user)
+    comment = get_object_or_404(
+        Comment.objects.select_related('article'), slug=comment_slug, is_active=True)
 
-    if like.exists():
-        Like.objects.filter(like_dislike=True).update(like_dislike=False)
-        Like.objects.filter(like_dislike=False).update(like_dislike=True)
-    else:
-        Like.objects.create(
-            like_dislike=True,
-            slug=slugify(
-                str(comment_slug) + str(datetime.now()), allow_unicode=False
-            ),
-            added_by=request.user
-        )
+    toggle_like(request.user, comment)
 
     messages.success(request, 'You reacted on this comment')
+    return redirect('pages:article', comment.article.slug)
+
+
+LIKE_TARGET_MODELS = {'topics': Topic, 'articles': Article, 'comments': Comment}
+
+
+@require_POST
+def toggle_like_json(request, target, slug):
+    # the like toggle for scripts (static/js/likes.js): no message and no
+    # redirect, just the new state and count
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': _('Log in to like this.')}, status=401)
+
+    if target not in LIKE_TARGET_MODELS:
+        raise Http404
+
+    liked_object = get_object_or_404(
+        LIKE_TARGET_MODELS[target], slug=slug, is_active=True)
+
+    liked, likes_count = toggle_like(request.user, liked_object)
+
+    return JsonResponse({'liked': liked, 'likes_count': likes_count})
 
 
 # # Reactions
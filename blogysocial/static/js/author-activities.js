@@ -0,0 +1,37 @@
+// Author activity tabs and their Newer/Older links load in place from the
+// same URL with ?fragment=1; without JavaScript they are ordinary links.
+document.addEventListener('click', function (event) {
+    var link = event.target.closest('#activities [data-fragment]');
+
+    if (!link) {
+        return;
+    }
+
+    event.preventDefault();
+
+    var url = new URL(link.href, window.location.href);
+    url.searchParams.set('fragment', '1');
+
+    fetch(url, { credentials: 'same-origin' })
+        .then(function (response) {
+            if (!response.ok) {
+                throw new Error(response.statusText);
+            }
+            return response.text();
+        })
+        .then(function (html) {
+            document.getElementById('activities-content').innerHTML = html;
+
+            if (link.classList.contains('nav-link')) {
+                document.querySelectorAll('#activities .nav-link').forEach(function (tab) {
+                    tab.classList.toggle('active', tab === link);
+                });
+            }
+
+            url.searchParams.delete('fragment');
+            window.history.replaceState(null, '', url.pathname + url.search + '#activities');
+        })
+        .catch(function () {
+            window.location.href = link.href;
+        });
+});
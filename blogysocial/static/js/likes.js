@@ -0,0 +1,37 @@
+// Like links with a data-like-url toggle in place through the JSON endpoint
+// and update the count element named by data-like-count; without JavaScript
+// they are ordinary links.
+document.addEventListener('click', function (event) {
+    var link = event.target.closest('[data-like-url]');
+
+    if (!link) {
+        return;
+    }
+
+    event.preventDefault();
+
+    var token = document.querySelector('input[name="csrfmiddlewaretoken"]');
+
+    fetch(link.dataset.likeUrl, {
+        method: 'POST',
+        credentials: 'same-origin',
+        headers: { 'X-CSRFToken': token ? token.value : '' }
+    })
+        .then(function (response) {
+            if (!response.ok) {
+                throw new Error(response.statusText);
+            }
+            return response.json();
+        })
+        .then(function (like) {
+            link.textContent = like.liked ? 'Unlike' : 'Like 👍';
+
+            var count = document.getElementById(link.dataset.likeCount);
+            if (count) {
+                count.textContent = like.likes_count + (like.likes_count < 2 ? ' like' : ' likes');
+            }
+        })
+        .catch(function () {
+            window.location.href = link.href;
+        });
+});